@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import json
+import time
+import random
+import string
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+import tracemalloc
+from datetime import date, datetime, timedelta
+
+# Directory of the utils modules, put on the path of the measuring subprocesses
+UTILS_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+UTILS_MODULES = (
+    "datetime_utils", "decorators", "file_utils", "graph_drawer", "json_utils",
+    "logging_utils", "string_utils", "tracing_utils", "tracking_utils",
+)
+# Heavy dependencies that importing a utils module must not load by itself
+LAZY_DEPENDENCIES = ("plotly", "matplotlib", "matplotlib.pyplot", "psutil")
+
+
+def _run_python(code, *options):
+    """Run code in a fresh interpreter with the utils directory on its path."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [UTILS_DIRECTORY, os.environ.get("PYTHONPATH")])))
+    return subprocess.run([sys.executable, *options, "-c", code],
+                          capture_output=True, text=True, check=True, env=env)
+
+
+def measure_import_time(module, repeat=5) -> float:
+    """Return the best cumulative import time of a module in milliseconds, as
+    reported by `python -X importtime` in a fresh interpreter."""
+    timings = []
+    for _ in range(repeat):
+        stderr = _run_python(f"import {module}", "-X", "importtime").stderr
+        # Lines look like: "import time:  self [us] | cumulative | imported package"
+        for line in stderr.splitlines():
+            fields = line.split('|')
+            if len(fields) == 3 and fields[2].strip() == module:
+                timings.append(int(fields[1]) / 1000)
+    return min(timings)
+
+
+def find_eagerly_imported_dependencies(module) -> list:
+    """Return the heavy dependencies (see LAZY_DEPENDENCIES) loaded by importing a module."""
+    code = (f"import sys, {module}; "
+            f"print(' '.join(name for name in {LAZY_DEPENDENCIES!r} if name in sys.modules))")
+    return _run_python(code).stdout.split()
+
+
+def check_import_times(baseline, current, tolerance=0.25, min_delta_ms=5.0) -> list:
+    """Compare import times (module -> ms) against a baseline and return the
+    regressions as (module, baseline ms, current ms), ignoring changes within
+    `tolerance` (relative) or `min_delta_ms` (absolute) as noise."""
+    regressions = []
+    for module, current_ms in current.items():
+        baseline_ms = baseline.get(module)
+        if baseline_ms is None:
+            continue
+        if current_ms > baseline_ms * (1 + tolerance) and current_ms - baseline_ms > min_delta_ms:
+            regressions.append((module, baseline_ms, current_ms))
+    return regressions
+
+
+def import_time_benchmark(modules=UTILS_MODULES, repeat=5, baseline_path=None, save_path=None) -> int:
+    """Measure the import times of the utils modules, check that heavy dependencies
+    are imported lazily and optionally compare against / save a JSON baseline.
+    Returns a process exit code: 1 if a check failed, 0 otherwise."""
+    failed = False
+    results = {}
+    for module in modules:
+        results[module] = measure_import_time(module, repeat)
+        eager = find_eagerly_imported_dependencies(module)
+        print(f"{module:<20} {results[module]:>8.1f} ms" + (f"  eager imports: {', '.join(eager)}" if eager else ""))
+        failed = failed or bool(eager)
+
+    if baseline_path:
+        with open(baseline_path, 'r', encoding='utf-8') as file:
+            baseline = json.load(file)
+        for module, baseline_ms, current_ms in check_import_times(baseline, results):
+            print(f"REGRESSION {module}: {baseline_ms:.1f} ms -> {current_ms:.1f} ms")
+            failed = True
+    if save_path:
+        with open(save_path, 'w', encoding='utf-8') as file:
+            json.dump(results, file, indent=4)
+    return 1 if failed else 0
+
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+
+
+def generate_dates(size, seed=0):
+    """Return `size` random dates between 2000 and 2030."""
+    rng = random.Random(seed)
+    return [date(2000, 1, 1) + timedelta(days=rng.randrange(11000)) for _ in range(size)]
+
+
+def generate_filenames(size, seed=0):
+    """Return `size` 3GPP-style file names, e.g. "A20230101.2300+0000-0000+0000_1.xml"."""
+    rng = random.Random(seed)
+    names = []
+    for index in range(size):
+        start = datetime(2023, 1, 1) + timedelta(minutes=15 * rng.randrange(35000))
+        end = start + timedelta(minutes=15)
+        offset = rng.choice(("+0000", "+0200", "-0530"))
+        names.append(f"A{start:%Y%m%d}.{start:%H%M}{offset}-{end:%H%M}{offset}_{index}.xml")
+    return names
+
+
+def generate_identifiers(size, distinct=1000, seed=0):
+    """Return `size` camelCase identifiers drawn from `distinct` different ones,
+    mimicking the repeated keys of API payloads."""
+    rng = random.Random(seed)
+    words = [''.join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 8))) for _ in range(200)]
+    pool = [words[0] + ''.join(word.capitalize() for word in rng.sample(words, rng.randint(1, 3)))
+            for _ in range(distinct)]
+    return [rng.choice(pool) for _ in range(size)]
+
+
+def generate_json_file(size, directory, seed=0):
+    """Write a JSON file with a list of `size` records and return its path."""
+    rng = random.Random(seed)
+    records = [{"id": index, "name": f"item-{index}", "value": rng.random(), "tags": ["a", "b"]}
+               for index in range(size)]
+    file_path = os.path.join(directory, f"records_{size}.json")
+    with open(file_path, 'w', encoding='utf-8') as file:
+        json.dump(records, file)
+    return file_path
+
+
+def generate_series(size, seed=0):
+    """Return (x, y) NumPy arrays of a noisy time series with `size` points."""
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    x = np.arange(size, dtype=float)
+    return x, np.sin(x / 500) + rng.normal(0, 0.1, size)
+
+
+def _bench_add_working_days(size, directory):
+    from datetime_utils import add_working_days
+
+    dates = generate_dates(size)
+    offsets = [index % 500 for index in range(size)]
+    return lambda: [add_working_days(day, offset) for day, offset in zip(dates, offsets)]
+
+
+def _bench_extract_datetime_from_filename(size, directory):
+    from string_utils import extract_datetime_from_filename
+
+    names = generate_filenames(size)
+    return lambda: [extract_datetime_from_filename(name) for name in names]
+
+
+def _bench_to_snake_case(size, directory):
+    from string_utils import to_snake_case
+
+    identifiers = generate_identifiers(size)
+    return lambda: [to_snake_case(identifier) for identifier in identifiers]
+
+
+def _bench_read_json(size, directory):
+    from json_utils import read_json
+
+    file_path = generate_json_file(size, directory)
+    return lambda: read_json(file_path)
+
+
+def _bench_plotly_draw_graph(size, directory):
+    from graph_drawer import PlotlyGraphDrawer
+
+    x, y = generate_series(size)
+
+    def run():
+        drawer = PlotlyGraphDrawer(images_directory=directory)
+        drawer.add_subplot_data({"title": "series", "data": [{"x": x, "y": y, "label": "y"}]})
+        drawer.draw_graph()
+        drawer.save_figure("plotly_benchmark", "html", compact=True)
+    return run
+
+
+def _bench_plt_draw_graph(size, directory):
+    from graph_drawer import PltGraphDrawer
+
+    x, y = generate_series(size)
+
+    def run():
+        drawer = PltGraphDrawer(images_directory=directory, figsize=(8, 6))
+        drawer.add_subplot_data({"title": "series", "data": [{"x": x, "y": y, "label": "y"}]})
+        drawer.draw_graph()
+        drawer.save_figure("plt_benchmark", "png")
+    return run
+
+
+def _bench_stream_series(size, directory):
+    import numpy as np
+    from graph_drawer import stream_series
+
+    x, y = generate_series(size)
+    records = [{"x": float(x_value), "y": float(y_value)} for x_value, y_value in zip(x, y)]
+    max_points = max(size // 100, 100)
+
+    def run():
+        return stream_series(records, "x", "y", max_points=max_points)
+
+    # The kept points must cover the whole input evenly, not just its tail
+    kept_x, _ = run()[(None, "y")].arrays()
+    counts = np.histogram(kept_x, 10, range=(x[0], x[-1]))[0]
+    if counts.min() < counts.mean() / 2:
+        raise RuntimeError(f"stream_series kept the points unevenly: {counts.tolist()}")
+    return run
+
+
+# Benchmark name -> setup(size, directory) returning the function to time
+BENCHMARKS = {
+    "add_working_days": _bench_add_working_days,
+    "extract_datetime_from_filename": _bench_extract_datetime_from_filename,
+    "to_snake_case": _bench_to_snake_case,
+    "read_json": _bench_read_json,
+    "plotly_draw_graph": _bench_plotly_draw_graph,
+    "plt_draw_graph": _bench_plt_draw_graph,
+    "stream_series": _bench_stream_series,
+}
+
+
+def measure(func, repeat=5, min_time=0.2) -> dict:
+    """Time func pyperf-style: one warm-up call, a calibrated number of calls per
+    run so each run takes at least min_time seconds, and `repeat` runs. Also
+    measures the peak traced memory of one separate call.
+
+    Returns:
+        dict: seconds per call (min, median, mean, stdev), loops per run and peak memory in bytes.
+    """
+    func()
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or loops >= 1_000_000:
+            break
+        loops *= 10 if elapsed < min_time / 10 else 2
+    timings = [elapsed / loops]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        timings.append((time.perf_counter() - start) / loops)
+
+    # Memory is measured separately, as tracing slows the code down
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline, _ = tracemalloc.get_traced_memory()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    if not was_tracing:
+        tracemalloc.stop()
+
+    return {
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.fmean(timings),
+        "stdev": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        "loops": loops,
+        "peak_memory": peak - baseline,
+    }
+
+
+def run_benchmarks(names=None, sizes=DEFAULT_SIZES, repeat=5, min_time=0.2) -> dict:
+    """Run the named benchmarks (all by default) at each size and return the results
+    keyed by "name[size]", together with information about the environment."""
+    unknown = set(names or ()) - set(BENCHMARKS)
+    if unknown:
+        raise ValueError(f"Unknown benchmarks: {', '.join(sorted(unknown))}")
+    if UTILS_DIRECTORY not in sys.path:
+        sys.path.insert(0, UTILS_DIRECTORY)
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for name in names or BENCHMARKS:
+            for size in sizes:
+                result = measure(BENCHMARKS[name](size, directory), repeat, min_time)
+                result["per_item_ns"] = result["median"] / size * 1e9
+                results[f"{name}[{size}]"] = result
+                print(f"{name + f'[{size}]':<45} {result['median'] * 1e3:>10.3f} ms "
+                      f"+- {result['stdev'] * 1e3:.3f}  peak {result['peak_memory'] / 1024:>10.1f} KiB")
+    return {
+        "python": platform.python_version(),
+        "machine": platform.platform(),
+        "timestamp": datetime.now().isoformat(timespec='seconds'),
+        "results": results,
+    }
+
+
+def measure_event_loop_latency(use_async=True, concurrent_reads=200, file_size=1024 * 1024, duration=1.0) -> dict:
+    """Measure how late a 1 ms ticker on the event loop runs while coroutines keep
+    reading files, either with the blocking read_file or with aread_file.
+
+    Returns:
+        dict: the number of reads done and the median, p99 and max ticker lag in ms.
+    """
+    import asyncio
+    from file_utils import read_file, aread_file
+
+    async def run(directory):
+        file_paths = []
+        for index in range(concurrent_reads):
+            file_path = os.path.join(directory, f"file_{index}.txt")
+            with open(file_path, 'w', encoding='utf-8') as file:
+                file.write('x' * file_size)
+            file_paths.append(file_path)
+
+        lags = []
+        reads = 0
+        stop = time.perf_counter() + duration
+
+        async def ticker():
+            while time.perf_counter() < stop:
+                expected = time.perf_counter() + 0.001
+                await asyncio.sleep(0.001)
+                lags.append(max(time.perf_counter() - expected, 0) * 1000)
+
+        async def reader(file_path):
+            nonlocal reads
+            while time.perf_counter() < stop:
+                if use_async:
+                    await aread_file(file_path)
+                else:
+                    read_file(file_path)
+                    await asyncio.sleep(0)
+                reads += 1
+
+        await asyncio.gather(ticker(), *(reader(file_path) for file_path in file_paths))
+        lags.sort()
+        return {"reads": reads, "median_lag_ms": statistics.median(lags),
+                "p99_lag_ms": lags[int(len(lags) * 0.99)], "max_lag_ms": lags[-1]}
+
+    if UTILS_DIRECTORY not in sys.path:
+        sys.path.insert(0, UTILS_DIRECTORY)
+    with tempfile.TemporaryDirectory() as directory:
+        return asyncio.run(run(directory))
+
+
+def compare_results(baseline, current, threshold=0.1) -> list:
+    """Compare two run_benchmarks outputs and return the regressions as
+    (benchmark, metric, baseline value, current value): a median time or peak
+    memory that grew by more than `threshold` (relative)."""
+    regressions = []
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        for metric in ("median", "peak_memory"):
+            if base[metric] and result[metric] > base[metric] * (1 + threshold):
+                regressions.append((name, metric, base[metric], result[metric]))
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks of the python utils")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run the hot path benchmarks")
+    run_parser.add_argument("names", nargs="*", help=f"Benchmarks to run: {', '.join(BENCHMARKS)}")
+    run_parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    run_parser.add_argument("--repeat", type=int, default=5)
+    run_parser.add_argument("--output", help="JSON file to write the results to")
+
+    compare_parser = subparsers.add_parser("compare", help="Compare two benchmark result files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.1)
+
+    latency_parser = subparsers.add_parser("loop-latency",
+                                           help="Compare event loop lag of blocking and async file reads")
+    latency_parser.add_argument("--concurrency", type=int, default=200)
+    latency_parser.add_argument("--file-size", type=int, default=1024 * 1024)
+    latency_parser.add_argument("--duration", type=float, default=1.0)
+
+    imports_parser = subparsers.add_parser("imports", help="Run the import time benchmark")
+    imports_parser.add_argument("modules", nargs="*", default=UTILS_MODULES)
+    imports_parser.add_argument("--repeat", type=int, default=5)
+    imports_parser.add_argument("--baseline", help="JSON file with import times to compare against")
+    imports_parser.add_argument("--save", help="JSON file to save the import times to")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        output = run_benchmarks(args.names, args.sizes, args.repeat)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as file:
+                json.dump(output, file, indent=4)
+    elif args.command == "compare":
+        with open(args.baseline, 'r', encoding='utf-8') as file:
+            baseline_results = json.load(file)
+        with open(args.current, 'r', encoding='utf-8') as file:
+            current_results = json.load(file)
+        regressions = compare_results(baseline_results, current_results, args.threshold)
+        for name, metric, baseline_value, current_value in regressions:
+            print(f"REGRESSION {name} {metric}: {baseline_value:.6g} -> {current_value:.6g} "
+                  f"({current_value / baseline_value - 1:+.1%})")
+        sys.exit(1 if regressions else 0)
+    elif args.command == "loop-latency":
+        for use_async in (False, True):
+            latency = measure_event_loop_latency(use_async, args.concurrency, args.file_size, args.duration)
+            print(f"{'aread_file' if use_async else 'read_file':<12} reads: {latency['reads']:>7}  "
+                  f"lag median {latency['median_lag_ms']:.2f} ms, p99 {latency['p99_lag_ms']:.2f} ms, "
+                  f"max {latency['max_lag_ms']:.2f} ms")
+    else:
+        sys.exit(import_time_benchmark(args.modules, args.repeat, args.baseline, args.save))
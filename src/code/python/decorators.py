@@ -1,21 +1,158 @@
 import os
+import json
+import time
 import errno
+import random
 import signal
+import struct
+import inspect
+import itertools
+import threading
+import contextvars
+from collections import namedtuple, OrderedDict
 from functools import wraps
-import psutil
-import time
 
 
-def func_timeout(seconds, error_message=os.strerror(errno.ETIME)):
+def _signal_timeout(func, args, kwargs, seconds, error_message):
+    """Run func with a SIGALRM interval timer; main thread only.
+
+    Nesting is supported: an outer timer that expires first is left in charge,
+    otherwise it is suspended and re-armed, with its remaining time, afterwards.
+    """
+    start = time.monotonic()
+    outer_delay, outer_interval = signal.getitimer(signal.ITIMER_REAL)
+    if outer_delay and outer_delay <= seconds:
+        return func(*args, **kwargs)
+
+    def _handler(signum, frame):
+        raise TimeoutError(error_message)
+
+    outer_handler = signal.signal(signal.SIGALRM, _handler)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        return func(*args, **kwargs)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)  # Disable the timer
+        signal.signal(signal.SIGALRM, outer_handler)
+        if outer_delay:
+            remaining = outer_delay - (time.monotonic() - start)
+            # An outer timer that ran out meanwhile fires right away
+            signal.setitimer(signal.ITIMER_REAL, max(remaining, 1e-6), outer_interval)
+
+
+def _thread_timeout(func, args, kwargs, seconds, error_message):
+    """Run func in a daemon worker thread and stop waiting for it after `seconds`.
+
+    Python threads cannot be killed, so a timed-out call keeps running in the
+    background; its result is discarded.
+    """
+    outcome = {}
+    context = contextvars.copy_context()
+
+    def _target():
+        try:
+            outcome["result"] = context.run(func, *args, **kwargs)
+        except BaseException as error:
+            outcome["error"] = error
+
+    worker = threading.Thread(target=_target, name=f"timeout-{func.__name__}", daemon=True)
+    worker.start()
+    worker.join(seconds)
+    if worker.is_alive():
+        raise TimeoutError(error_message)
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["result"]
+
+
+def _process_timeout(func, args, kwargs, seconds, error_message):
+    """Run func in a forked child process that is terminated after `seconds`.
+
+    The function is not pickled (the child is forked), but its result or
+    exception is sent back through a pipe and so must be picklable. Forking
+    needs a POSIX system, and in a process with other threads the child can
+    deadlock on a lock one of them held at the fork (e.g. of logging).
+    """
+    import multiprocessing
+    if "fork" not in multiprocessing.get_all_start_methods():
+        raise ValueError('mode="process" needs the fork start method, which this platform lacks')
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+
+    def _target():
+        try:
+            sender.send((True, func(*args, **kwargs)))
+        except BaseException as error:
+            sender.send((False, error))
+
+    child = multiprocessing.get_context("fork").Process(target=_target, daemon=True)
+    child.start()
+    sender.close()
+    try:
+        if not receiver.poll(seconds):
+            child.terminate()
+            raise TimeoutError(error_message)
+        try:
+            succeeded, value = receiver.recv()
+        except EOFError:
+            raise RuntimeError(f"{func.__name__} exited with code {child.exitcode} without a result") from None
+    finally:
+        child.join()
+        receiver.close()
+    if not succeeded:
+        raise value
+    return value
+
+
+def _call_with_timeout(func, args, kwargs, seconds, error_message, mode="auto"):
+    """Run func with a timeout using the given mode: "signal", "thread",
+    "process" or "auto" (signal on the main thread, thread elsewhere)."""
+    if not seconds:
+        return func(*args, **kwargs)
+    if mode == "auto":
+        on_main_thread = threading.current_thread() is threading.main_thread()
+        mode = "signal" if on_main_thread and hasattr(signal, "SIGALRM") else "thread"
+    if mode == "signal":
+        return _signal_timeout(func, args, kwargs, seconds, error_message)
+    if mode == "thread":
+        return _thread_timeout(func, args, kwargs, seconds, error_message)
+    if mode == "process":
+        return _process_timeout(func, args, kwargs, seconds, error_message)
+    raise ValueError(f"Unknown timeout mode: {mode}")
+
+
+async def _async_call_with_timeout(func, args, kwargs, seconds, error_message):
+    """Await the coroutine function func with a timeout."""
+    import asyncio
+    if not seconds:
+        return await func(*args, **kwargs)
+    try:
+        return await asyncio.wait_for(func(*args, **kwargs), seconds)
+    except asyncio.TimeoutError:
+        raise TimeoutError(error_message) from None
+
+
+def func_timeout(seconds, error_message=os.strerror(errno.ETIME), mode="auto"):
     """
     A decorator to enforce a timeout on the execution of a function.
     Raises a `TimeoutError` if the decorated function does not 
     complete execution within the specified number of seconds.
 
+    On the main thread the timeout is enforced with a SIGALRM interval timer,
+    which interrupts the function; timeouts can be nested and an existing timer
+    and handler are restored afterwards. In other threads the function runs in
+    a worker thread (mode="thread") or a forked process (mode="process", which
+    can also be terminated). Coroutine functions are awaited with asyncio.wait_for.
+
+    mode="process" is POSIX-only, and unsafe in multi-threaded processes (such
+    as thread-pool workers): the forked child only has a copy of the calling
+    thread and can deadlock on a lock (logging, imports) another thread held.
+    Prefer mode="thread" there.
+
     Args:
-        seconds (int): The maximum number of seconds the function is allowed to run.
+        seconds (float): The maximum number of seconds the function is allowed to run.
         error_message (str, optional): The error message to include in the
             `TimeoutError`. Defaults to the system's error message for `ETIME`.
+        mode (str, optional): "auto" (default), "signal", "thread" or "process".
 
     Example:
         @func_timeout(5, "Function execution exceeded the timeout limit")
@@ -24,21 +161,21 @@ def func_timeout(seconds, error_message=os.strerror(errno.ETIME)):
 
         # TimeoutError is raised after 5 seconds.
         long_running_function()
+
+        @func_timeout(0.5)
+        async def fetch():
+            await asyncio.sleep(1)
     """
     def decorator(func):
-        def _handler(signum, frame):
-            raise TimeoutError(error_message)
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                return await _async_call_with_timeout(func, args, kwargs, seconds, error_message)
+            return async_wrapper
 
         @wraps(func)
         def wrapper(*args, **kwargs):
-            # Set the signal handler and the alarm
-            signal.signal(signal.SIGALRM, _handler)
-            signal.alarm(seconds)
-            try:
-                result = func(*args, **kwargs)
-            finally:
-                signal.alarm(0)  # Disable the alarm
-            return result
+            return _call_with_timeout(func, args, kwargs, seconds, error_message, mode)
         return wrapper
     return decorator
 
@@ -47,35 +184,49 @@ def method_timeout(func):
     """
     A decorator to enforce a timeout on methods of a class. The timeout duration
     is determined by the `timeout_timer` attribute of the class instance.
+    The wrapped method's return value is passed through.
 
     Usage:
         - The class using this decorator must have an attribute `timeout_timer`
           that specifies the timeout duration in seconds.
         - Apply this decorator to methods of the class to enforce the timeout.
+          Coroutine methods are supported as well.
     """
-    def _handler(signum, frame):
-        raise TimeoutError("Timer expired")
+    if inspect.iscoroutinefunction(func):
+        @wraps(func)
+        async def async_wrapper(self, *args, **kwargs):
+            return await _async_call_with_timeout(func, (self, *args), kwargs,
+                                                  self.timeout_timer, "Timer expired")
+        return async_wrapper
 
     @wraps(func)
     def wrapper(self, *args, **kwargs):
-        # Set the signal handler and the alarm
-        signal.signal(signal.SIGALRM, _handler)
-        # Timeout time is the value of the object's timeout_time attr
-        signal.alarm(self.timeout_timer)
-        try:
-            func(self, *args, **kwargs)
-        finally:
-            signal.alarm(0)  # Disable the alarm
+        # Timeout time is the value of the object's timeout_timer attr
+        return _call_with_timeout(func, (self, *args), kwargs, self.timeout_timer, "Timer expired")
 
     return wrapper
 
 
+_process = None
+
+
+def _get_process():
+    """Return a psutil.Process handle for the current process, created once per pid."""
+    global _process
+    if _process is None or _process.pid != os.getpid():
+        # psutil is imported on first use to keep module import cheap
+        import psutil
+        _process = psutil.Process(os.getpid())
+    return _process
+
+
 def track(func):
     """
     A decorator that tracks the memory usage and execution time of a function.
 
     This decorator measures the memory usage of the current process before and
     after the function execution, as well as the time taken to execute the function.
+    It prints one line per call; for functions called many times, use `profiled`.
 
     Args:
         func (callable): The function to be wrapped and tracked.
@@ -83,12 +234,13 @@ def track(func):
     Returns:
         callable: The wrapped function with tracking functionality.
     """
+    @wraps(func)
     def wrapper(*args, **kwargs):
-        process = psutil.Process(os.getpid())
+        process = _get_process()
         mem_before = process.memory_info().rss
-        start = time.time()
+        start = time.perf_counter()
         result = func(*args, **kwargs)
-        elapsed_time = time.time() - start
+        elapsed_time = time.perf_counter() - start
         mem_after = process.memory_info().rss
         print(f"{func.__name__}: "
               f"mem before: {mem_before}, "
@@ -98,3 +250,679 @@ def track(func):
 
         return result
     return wrapper
+
+
+class ProfileStats:
+    """Aggregated call statistics of one function profiled with `profiled`.
+
+    Latencies are kept in a fixed-size log-linear histogram (8 sub-buckets per
+    power of two, i.e. within 12.5%), so memory does not grow with the number
+    of calls.
+    """
+    _SUB_BUCKETS = 8
+    _NUM_BUCKETS = 64 * _SUB_BUCKETS
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.errors = 0
+        self.total_ns = 0
+        self.min_ns = None
+        self.max_ns = 0
+        self.histogram = [0] * self._NUM_BUCKETS
+        self.memory_samples = 0
+        self.rss_delta_total = 0
+        self.lock = threading.Lock()
+
+    @classmethod
+    def _bucket_index(cls, ns):
+        if ns < cls._SUB_BUCKETS:
+            return ns
+        shift = ns.bit_length() - 4
+        return (shift + 1) * cls._SUB_BUCKETS + (ns >> shift) - cls._SUB_BUCKETS
+
+    @classmethod
+    def _bucket_value(cls, index):
+        """Return the midpoint of the latency range of a histogram bucket."""
+        if index < cls._SUB_BUCKETS:
+            return index
+        shift = index // cls._SUB_BUCKETS - 1
+        lower = (index % cls._SUB_BUCKETS + cls._SUB_BUCKETS) << shift
+        return lower + (1 << shift) // 2
+
+    def record(self, elapsed_ns, failed=False, rss_delta=None):
+        with self.lock:
+            self.calls += 1
+            self.errors += failed
+            self.total_ns += elapsed_ns
+            if self.min_ns is None or elapsed_ns < self.min_ns:
+                self.min_ns = elapsed_ns
+            if elapsed_ns > self.max_ns:
+                self.max_ns = elapsed_ns
+            self.histogram[self._bucket_index(elapsed_ns)] += 1
+            if rss_delta is not None:
+                self.memory_samples += 1
+                self.rss_delta_total += rss_delta
+
+    def percentile(self, percent):
+        """Return the approximate latency in ns below which `percent`% of the calls fall."""
+        if not self.calls:
+            return None
+        rank = percent / 100 * self.calls
+        seen = 0
+        for index, count in enumerate(self.histogram):
+            seen += count
+            if count and seen >= rank:
+                return min(max(self._bucket_value(index), self.min_ns), self.max_ns)
+        return self.max_ns
+
+    def as_dict(self):
+        return {
+            "name": self.name,
+            "calls": self.calls,
+            "errors": self.errors,
+            "total_ms": self.total_ns / 1e6,
+            "mean_us": self.total_ns / self.calls / 1e3 if self.calls else None,
+            "min_us": self.min_ns / 1e3 if self.min_ns is not None else None,
+            "max_us": self.max_ns / 1e3,
+            "p50_us": self._to_us(self.percentile(50)),
+            "p95_us": self._to_us(self.percentile(95)),
+            "p99_us": self._to_us(self.percentile(99)),
+            "memory_samples": self.memory_samples,
+            "mean_rss_delta": self.rss_delta_total / self.memory_samples if self.memory_samples else None,
+        }
+
+    @staticmethod
+    def _to_us(ns):
+        return ns / 1e3 if ns is not None else None
+
+
+# Registry of the functions decorated with `profiled`: name -> ProfileStats
+_profiles = {}
+_profiling_enabled = True
+
+
+def profiled(func=None, *, name=None, sample_memory_every=0):
+    """
+    A low-overhead decorator that aggregates call statistics of a function into
+    a registry instead of printing per call: call and error counts, and a
+    perf_counter_ns latency histogram giving p50/p95/p99. With
+    sample_memory_every=N, the RSS delta of every Nth call is also sampled.
+
+    While profiling is disabled (see `disable_profiling`), the only overhead is
+    a flag check, so the decorator can be left on in production.
+
+    Args:
+        name (str, optional): The registry name. Defaults to the qualified function name.
+        sample_memory_every (int): Sample the RSS delta every N calls (0 disables it).
+
+    Example:
+        @profiled
+        def parse(line):
+            ...
+
+        @profiled(sample_memory_every=100)
+        def load(path):
+            ...
+
+        print(report())
+    """
+    def decorator(func):
+        stats_name = name or f"{func.__module__}.{func.__qualname__}"
+        stats = _profiles.get(stats_name) or _profiles.setdefault(stats_name, ProfileStats(stats_name))
+        call_counter = itertools.count(1)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _profiling_enabled:
+                return func(*args, **kwargs)
+            rss_before = None
+            if sample_memory_every and next(call_counter) % sample_memory_every == 0:
+                rss_before = _get_process().memory_info().rss
+            failed = True
+            start = time.perf_counter_ns()
+            try:
+                result = func(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                elapsed_ns = time.perf_counter_ns() - start
+                rss_delta = None
+                if rss_before is not None:
+                    rss_delta = _get_process().memory_info().rss - rss_before
+                stats.record(elapsed_ns, failed, rss_delta)
+
+        wrapper.profile_stats = stats
+        return wrapper
+
+    if func is not None:
+        return decorator(func)
+    return decorator
+
+
+def enable_profiling():
+    """Turn on recording for all `profiled` functions."""
+    global _profiling_enabled
+    _profiling_enabled = True
+
+
+def disable_profiling():
+    """Turn off recording for all `profiled` functions."""
+    global _profiling_enabled
+    _profiling_enabled = False
+
+
+def reset_profiles():
+    """Clear the statistics recorded so far for all `profiled` functions."""
+    for stats in _profiles.values():
+        stats.__init__(stats.name)
+
+
+def report(sort_by="total_ms") -> str:
+    """Return a text table of the statistics of all `profiled` functions that were called."""
+    rows = sorted((stats.as_dict() for stats in _profiles.values() if stats.calls),
+                  key=lambda row: row[sort_by], reverse=True)
+    lines = [f"{'function':<50} {'calls':>10} {'total ms':>12} {'p50 us':>10} {'p95 us':>10} {'p99 us':>10}"]
+    for row in rows:
+        lines.append(f"{row['name']:<50} {row['calls']:>10} {row['total_ms']:>12.3f} "
+                     f"{row['p50_us']:>10.2f} {row['p95_us']:>10.2f} {row['p99_us']:>10.2f}")
+    return '\n'.join(lines)
+
+
+def report_json(file_path=None) -> str:
+    """Return the statistics of all `profiled` functions as JSON, optionally writing it to a file."""
+    content = json.dumps([stats.as_dict() for stats in _profiles.values() if stats.calls], indent=4)
+    if file_path:
+        with open(file_path, 'w', encoding='utf-8') as file:
+            file.write(content)
+    return content
+
+
+class CacheInfo(namedtuple("CacheInfo", "hits misses maxsize currsize")):
+    """Statistics of a `memoize` cache, like functools' CacheInfo, plus the hit ratio."""
+    __slots__ = ()
+
+    @property
+    def hit_ratio(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class _InFlight:
+    """The pending result of a call shared by the threads that miss the same key."""
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+    def wait(self):
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class MemoizeCache:
+    """
+    The thread-safe LRU store behind `memoize` and `memoize_file`.
+
+    Entries are (value, expiry time, version); an entry is stale once its TTL
+    expired or when it is looked up with another version (e.g. a file mtime).
+    Concurrent misses of the same key are de-duplicated: the first caller
+    computes the value and the others wait for its result (single flight).
+    Exceptions are passed to the waiting callers but never cached.
+    """
+    def __init__(self, maxsize=128, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def _lookup(self, key, version):
+        """Return (True, value) for a fresh entry, else (False, None). Must hold the lock."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, expires_at, entry_version = entry
+            if entry_version == version and (expires_at is None or time.monotonic() < expires_at):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, value
+            del self._entries[key]
+        return False, None
+
+    def _store(self, key, value, version):
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._entries[key] = (value, expires_at, version)
+            self._entries.move_to_end(key)
+            if self.maxsize is not None and len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def get_or_call(self, key, call, version=None):
+        """Return the cached value of key, or compute it with call() on a miss."""
+        with self._lock:
+            found, value = self._lookup(key, version)
+            if found:
+                return value
+            in_flight = self._in_flight.get(key)
+            owner = in_flight is None
+            if owner:
+                self.misses += 1
+                in_flight = self._in_flight[key] = _InFlight()
+            else:
+                # Served by the call already running for this key
+                self.hits += 1
+        if not owner:
+            return in_flight.wait()
+        try:
+            in_flight.result = call()
+            self._store(key, in_flight.result, version)
+            return in_flight.result
+        except BaseException as error:
+            in_flight.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            in_flight.done.set()
+
+    async def aget_or_call(self, key, call, version=None):
+        """Like get_or_call for a coroutine function: call() returns an awaitable."""
+        import asyncio
+
+        with self._lock:
+            found, value = self._lookup(key, version)
+            if found:
+                return value
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                self.misses += 1
+                future = self._in_flight[key] = asyncio.get_running_loop().create_future()
+            else:
+                self.hits += 1
+        if not owner:
+            # shield: a cancelled waiter must not cancel the shared call
+            return await asyncio.shield(future)
+        try:
+            result = await call()
+            self._store(key, result, version)
+            future.set_result(result)
+            return result
+        except BaseException as error:
+            future.set_exception(error)
+            # Mark the exception as retrieved if nobody else waits for it
+            future.exception()
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+    def discard(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+
+# Separates positional from keyword arguments in the cache keys
+_KWARGS_MARK = object()
+
+
+def _make_key(args, kwargs):
+    """Build a hashable cache key from call arguments, like functools.lru_cache does."""
+    if kwargs:
+        return args + (_KWARGS_MARK,) + tuple(kwargs.items())
+    return args
+
+
+def _memoized_wrapper(func, cache, make_key):
+    """Wrap func (or coroutine function func) so its calls go through cache.
+    make_key(args, kwargs) returns (key, version)."""
+    if inspect.iscoroutinefunction(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            key, version = make_key(args, kwargs)
+            return await cache.aget_or_call(key, lambda: func(*args, **kwargs), version)
+    else:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key, version = make_key(args, kwargs)
+            return cache.get_or_call(key, lambda: func(*args, **kwargs), version)
+
+    wrapper.cache = cache
+    wrapper.cache_info = cache.info
+    wrapper.cache_clear = cache.clear
+    return wrapper
+
+
+def memoize(func=None, *, maxsize=128, ttl=None, key=None):
+    """
+    A decorator caching the results of a function (or coroutine function).
+
+    Unlike functools.lru_cache, entries can expire after `ttl` seconds, unhashable
+    arguments can be mapped to a key with `key`, and concurrent calls with the
+    same missing key run the function only once while the other callers wait
+    for its result. Exceptions are not cached.
+
+    Args:
+        maxsize (int, optional): The maximum number of entries, the least recently
+            used one being evicted first. None means unbounded.
+        ttl (float, optional): The number of seconds an entry stays valid.
+        key (callable, optional): Called with the function arguments, returns the
+            hashable cache key. Defaults to the arguments themselves.
+
+    The wrapper has cache_info() (hits, misses, maxsize, currsize and hit_ratio)
+    and cache_clear() like lru_cache.
+
+    Example:
+        @memoize(maxsize=1024, ttl=60)
+        def lookup(host):
+            ...
+
+        @memoize(key=lambda records: tuple(sorted(records)))
+        def summarize(records):
+            ...
+
+        print(lookup.cache_info().hit_ratio)
+    """
+    def decorator(func):
+        if key is None:
+            make_key = lambda args, kwargs: (_make_key(args, kwargs), None)
+        else:
+            make_key = lambda args, kwargs: (key(*args, **kwargs), None)
+        return _memoized_wrapper(func, MemoizeCache(maxsize, ttl), make_key)
+
+    if func is not None:
+        return decorator(func)
+    return decorator
+
+
+def memoize_file(func=None, *, maxsize=32, ttl=None):
+    """
+    A `memoize` variant for functions whose first argument is a file path, such
+    as read_file or read_json: the cached result is reused until the file's
+    modification time or size change.
+
+    The cached objects are shared between the callers, so they must not be
+    modified in place.
+
+    Example:
+        cached_read_json = memoize_file(read_json)
+        config = cached_read_json("config.json")  # read again only after the file changed
+    """
+    def decorator(func):
+        def make_key(args, kwargs):
+            file_path, *rest = args
+            stat = os.stat(file_path)
+            return (os.path.abspath(file_path), *_make_key(tuple(rest), kwargs)), (stat.st_mtime_ns, stat.st_size)
+        return _memoized_wrapper(func, MemoizeCache(maxsize, ttl), make_key)
+
+    if func is not None:
+        return decorator(func)
+    return decorator
+
+
+def _backoff_delay(attempt, base_delay, max_delay, multiplier, jitter):
+    """Return the delay before retry number `attempt` (1-based): exponential backoff,
+    randomized so that clients failing together do not retry together."""
+    delay = min(max_delay, base_delay * multiplier ** (attempt - 1))
+    if jitter == "full":
+        return random.uniform(0, delay)
+    if jitter == "equal":
+        return delay / 2 + random.uniform(0, delay / 2)
+    return delay
+
+
+def retry(func=None, *, attempts=3, exceptions=(Exception,), retry_if=None, base_delay=0.1, max_delay=10.0,
+          multiplier=2.0, jitter="full", deadline=None, attempt_timeout=None, timeout_mode="auto", on_retry=None):
+    """
+    A decorator retrying a function (or coroutine function) that raises, with
+    exponential backoff and jitter between the attempts.
+
+    The attempts run through the same timeout engine as `func_timeout`: each one
+    is limited to attempt_timeout seconds and to what is left of the total
+    deadline, so a hanging call cannot use up the whole budget. No retry is
+    started if its delay would end after the deadline; the last error is raised.
+    Coroutine functions back off with asyncio.sleep and do not block the event loop.
+
+    Args:
+        attempts (int): The maximum number of calls.
+        exceptions (tuple): The exception types that are retried; others propagate at once.
+        retry_if (callable, optional): Called with the exception; retry only if it returns True.
+        base_delay, max_delay (float): The first and the maximum backoff delay in seconds.
+        multiplier (float): The backoff growth per attempt.
+        jitter (str or None): "full" (random delay up to the backoff), "equal" (half fixed,
+            half random) or None (no randomization).
+        deadline (float, optional): The total number of seconds for all attempts and delays.
+        attempt_timeout (float, optional): The maximum number of seconds of one attempt.
+        timeout_mode (str): The func_timeout mode used for the attempt timeouts.
+        on_retry (callable, optional): Called with (attempt, exception, delay) before each retry.
+
+    Example:
+        @retry(attempts=5, exceptions=(ConnectionError, TimeoutError), deadline=30, attempt_timeout=5)
+        def fetch(url):
+            ...
+
+        @retry(retry_if=lambda error: error.status >= 500)
+        async def post(payload):
+            ...
+    """
+    if jitter not in ("full", "equal", None):
+        raise ValueError(f"Unknown jitter: {jitter}")
+
+    def decorator(func):
+        error_message = f"{func.__name__} did not complete in time"
+
+        def _next_delay(attempt, error, started):
+            """Return the delay before the next attempt, or None to give up and re-raise."""
+            if not isinstance(error, exceptions) or (retry_if is not None and not retry_if(error)):
+                return None
+            if attempt >= attempts:
+                return None
+            delay = _backoff_delay(attempt, base_delay, max_delay, multiplier, jitter)
+            if deadline is not None and time.monotonic() - started + delay >= deadline:
+                return None
+            if on_retry is not None:
+                on_retry(attempt, error, delay)
+            return delay
+
+        def _attempt_timeout(started):
+            if deadline is None:
+                return attempt_timeout
+            # The backoff can overrun the deadline by a hair: time the attempt out at once then
+            remaining = max(deadline - (time.monotonic() - started), 1e-6)
+            return min(remaining, attempt_timeout) if attempt_timeout else remaining
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                import asyncio
+
+                started = time.monotonic()
+                for attempt in itertools.count(1):
+                    try:
+                        return await _async_call_with_timeout(func, args, kwargs, _attempt_timeout(started),
+                                                              error_message)
+                    except Exception as error:
+                        delay = _next_delay(attempt, error, started)
+                        if delay is None:
+                            raise
+                    await asyncio.sleep(delay)
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.monotonic()
+            for attempt in itertools.count(1):
+                try:
+                    return _call_with_timeout(func, args, kwargs, _attempt_timeout(started),
+                                              error_message, timeout_mode)
+                except Exception as error:
+                    delay = _next_delay(attempt, error, started)
+                    if delay is None:
+                        raise
+                time.sleep(delay)
+        return wrapper
+
+    if func is not None:
+        return decorator(func)
+    return decorator
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket: `rate` tokens per second are added up to
+    `capacity`, and each call takes one.
+
+    With lock_file, the bucket state lives in that file and updates hold an
+    exclusive flock on it, so all processes of the machine using the same file
+    share one limit (POSIX only).
+
+    Callers reserve tokens and sleep off the returned wait themselves, which
+    keeps the lock held only for the state update and serves waiters in order.
+    """
+    _STATE = struct.Struct("dd")
+
+    def __init__(self, rate, capacity=None, lock_file=None):
+        if rate <= 0:
+            raise ValueError(f"The rate must be positive: {rate}")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1)
+        self.lock_file = lock_file
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self._fd = None
+        self._fd_pid = None
+
+    def _file_descriptor(self):
+        # flock locks are shared by forked processes through an inherited descriptor,
+        # so every process opens the file itself
+        if self._fd_pid != os.getpid():
+            self._fd = os.open(self.lock_file, os.O_RDWR | os.O_CREAT, 0o644)
+            self._fd_pid = os.getpid()
+        return self._fd
+
+    def _take(self, tokens, timeout, state, now):
+        """Refill and take tokens from state [tokens, updated] at time now. Return the
+        wait in seconds, or None if it would exceed timeout (nothing is taken then)."""
+        # An update time in the future (the clock was set back) refills nothing
+        available = min(self.capacity, state[0] + max(now - state[1], 0) * self.rate)
+        state[1] = now
+        wait = max(tokens - available, 0) / self.rate
+        state[0] = available
+        if timeout is not None and wait > timeout:
+            return None
+        # The balance may go negative: the tokens of the waiting callers are already reserved
+        state[0] = available - tokens
+        return wait
+
+    def reserve(self, tokens=1, timeout=None):
+        """Take tokens and return the number of seconds to wait before using them,
+        or None (taking nothing) if that wait would be longer than timeout."""
+        with self._lock:
+            if self.lock_file is None:
+                state = [self._tokens, self._updated]
+                wait = self._take(tokens, timeout, state, time.monotonic())
+                self._tokens, self._updated = state
+                return wait
+
+            import fcntl
+            fd = self._file_descriptor()
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                data = os.pread(fd, self._STATE.size, 0)
+                # The file outlives reboots, which restart the monotonic clock: use wall time
+                now = time.time()
+                state = list(self._STATE.unpack(data)) if len(data) == self._STATE.size else [self.capacity, now]
+                wait = self._take(tokens, timeout, state, now)
+                os.pwrite(fd, self._STATE.pack(*state), 0)
+                return wait
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+
+    def acquire(self, tokens=1, timeout=None) -> bool:
+        """Wait until tokens are available and take them. Returns False if the
+        wait would exceed timeout."""
+        wait = self.reserve(tokens, timeout)
+        if wait is None:
+            return False
+        if wait:
+            time.sleep(wait)
+        return True
+
+    async def acquire_async(self, tokens=1, timeout=None) -> bool:
+        """Like acquire, waiting with asyncio.sleep."""
+        import asyncio
+
+        wait = self.reserve(tokens, timeout)
+        if wait is None:
+            return False
+        if wait:
+            await asyncio.sleep(wait)
+        return True
+
+    def __del__(self):
+        if self._fd is not None and self._fd_pid == os.getpid():
+            os.close(self._fd)
+
+
+def rate_limit(calls, period=1.0, burst=None, lock_file=None, timeout=None):
+    """
+    A decorator limiting a function (or coroutine function) to `calls` calls per
+    `period` seconds with a token bucket; callers over the limit wait for their
+    turn (with asyncio.sleep for coroutines).
+
+    Args:
+        calls (float): The number of calls allowed per period.
+        period (float): The period in seconds.
+        burst (int, optional): The number of calls that may run back to back
+            after an idle time. Defaults to `calls`.
+        lock_file (str, optional): Share the limit between all processes using this file.
+        timeout (float, optional): Raise TimeoutError instead of waiting longer than this.
+
+    The bucket is available as the wrapper's `bucket` attribute.
+
+    Example:
+        @rate_limit(10, period=1, lock_file="/tmp/api.ratelimit")
+        def call_api(request):
+            ...
+
+        @rate_limit(100, period=60)
+        async def send(message):
+            ...
+    """
+    bucket = TokenBucket(calls / period, burst if burst is not None else calls, lock_file)
+
+    def decorator(func):
+        error_message = f"{func.__name__} rate limit wait exceeded {timeout} s"
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if not await bucket.acquire_async(timeout=timeout):
+                    raise TimeoutError(error_message)
+                return await func(*args, **kwargs)
+            async_wrapper.bucket = bucket
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not bucket.acquire(timeout=timeout):
+                raise TimeoutError(error_message)
+            return func(*args, **kwargs)
+        wrapper.bucket = bucket
+        return wrapper
+    return decorator
@@ -1,4 +1,23 @@
 import os
+import mmap
+import heapq
+import shutil
+import fnmatch
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from contextlib import contextmanager
+from functools import partial
+
+from decorators import memoize_file
+
+# Default buffer size for streaming reads and buffered writes (1 MiB)
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+# Size of the thread pool shared by the async I/O functions
+IO_EXECUTOR_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+_io_executor = None
+_io_executor_lock = threading.Lock()
 
 
 def read_file(file_path: str) -> str:
@@ -7,12 +26,311 @@ def read_file(file_path: str) -> str:
         return file.read()
 
 
+# read_file reusing the content until the file's mtime or size change
+read_file_cached = memoize_file(read_file)
+
+
+def iter_lines(file_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """Lazily yield the lines of a text file, line endings included.
+
+    Only one buffer of chunk_size bytes is held in memory at a time,
+    regardless of the file size.
+
+    Example:
+    for line in iter_lines("export.csv"):
+        process(line)
+    """
+    with open(file_path, 'r', encoding='utf-8', buffering=chunk_size) as file:
+        yield from file
+
+
+def iter_chunks(file_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """Lazily yield the contents of a file as bytes chunks of up to chunk_size bytes.
+
+    Example:
+    for chunk in iter_chunks("export.bin"):
+        digest.update(chunk)
+    """
+    with open(file_path, 'rb', buffering=0) as file:
+        yield from iter(partial(file.read, chunk_size), b'')
+
+
+@contextmanager
+def mmap_file(file_path: str):
+    """Memory-map a file read-only and yield a zero-copy memoryview of its contents.
+
+    Pages are loaded by the OS on access, so even multi-GB files can be sliced
+    without reading them into memory. Slices of the view must not outlive the
+    with block.
+
+    Example:
+    with mmap_file("export.bin") as view:
+        header = bytes(view[:16])
+    """
+    with open(file_path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            # Empty files cannot be mapped
+            yield memoryview(b'')
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                yield view
+            finally:
+                view.release()
+
+
 def write_file(file_path: str, content: str):
     """Write a string to a file."""
     with open(file_path, 'w', encoding='utf-8') as file:
         file.write(content)
 
 
+def _create_temp_file(file_path: str):
+    """Create a new, empty temporary file next to file_path and return (fd, path).
+
+    Unlike tempfile.mkstemp (mode 0600), the file is created with mode 0666 and
+    the kernel applies the umask, so it gets the permissions open() gives a new file.
+    """
+    directory, name = os.path.split(os.path.abspath(file_path))
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+    while True:
+        tmp_path = os.path.join(directory, f".{name}.{os.urandom(6).hex()}.tmp")
+        try:
+            return os.open(tmp_path, flags, 0o666), tmp_path
+        except FileExistsError:
+            continue
+
+
+@contextmanager
+def _atomic_write(file_path: str, mode='w', buffer_size: int = DEFAULT_CHUNK_SIZE):
+    """Yield a file object writing to a temporary file next to file_path, which
+    replaces file_path (keeping the permissions of an existing file) once the
+    with block completes, and is removed if it fails."""
+    fd, tmp_path = _create_temp_file(file_path)
+    try:
+        encoding = None if 'b' in mode else 'utf-8'
+        with os.fdopen(fd, mode, encoding=encoding, buffering=buffer_size) as file:
+            yield file
+            file.flush()
+            os.fsync(file.fileno())
+        try:
+            # Keep the permissions of the file being replaced
+            os.chmod(tmp_path, os.stat(file_path).st_mode & 0o7777)
+        except FileNotFoundError:
+            pass
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def write_file_atomic(file_path: str, content: str, buffer_size: int = DEFAULT_CHUNK_SIZE):
+    """Atomically write a string to a file.
+
+    The content is written through a large buffer to a temporary file in the
+    same directory, which then replaces the target with os.replace, so readers
+    see either the old or the new file and never a partially written one.
+
+    Example:
+    write_file_atomic("report.txt", "done")
+    """
+    with _atomic_write(file_path, 'w', buffer_size) as file:
+        file.write(content)
+
+
+def copy_file_atomic(source_path: str, file_path: str, buffer_size: int = DEFAULT_CHUNK_SIZE):
+    """Atomically copy a file, like write_file_atomic: readers of file_path see
+    either the old or the new file and never a partially copied one.
+
+    Example:
+    copy_file_atomic("cache/figure.png", "reports/figure.png")
+    """
+    with open(source_path, 'rb') as source, _atomic_write(file_path, 'wb', buffer_size) as file:
+        shutil.copyfileobj(source, file, buffer_size)
+
+
 def get_file_size(file_path: str) -> int:
     """Return the size of a file in bytes."""
     return os.path.getsize(file_path)
+
+
+def _scan_directory(directory, pattern, extensions, follow_symlinks, onerror):
+    """Scan one directory: return its matching (path, size) files and its subdirectories.
+    Sizes come from DirEntry.stat(), which is cached on the entry (and free on Windows)."""
+    files, subdirectories = [], []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=follow_symlinks):
+                        subdirectories.append(entry.path)
+                    elif entry.is_file(follow_symlinks=follow_symlinks):
+                        name = entry.name
+                        if extensions and not name.lower().endswith(extensions):
+                            continue
+                        if pattern and not fnmatch.fnmatch(name, pattern):
+                            continue
+                        files.append((entry.path, entry.stat(follow_symlinks=follow_symlinks).st_size))
+                except OSError as error:
+                    if onerror:
+                        onerror(error)
+    except OSError as error:
+        if onerror:
+            onerror(error)
+    return files, subdirectories
+
+
+def scan_files(root: str, pattern=None, extensions=None, follow_symlinks=False, workers=None, onerror=None):
+    """Recursively and lazily yield (path, size in bytes) for the files under root.
+
+    Args:
+        root (str): The directory to scan.
+        pattern (str, optional): A glob pattern the file names must match, e.g. "A2023*.xml".
+        extensions (iterable of str, optional): Accepted file extensions, e.g. [".xml", ".csv"].
+        follow_symlinks (bool): Follow symbolic links to files and directories.
+        workers (int, optional): Scan directories in a pool of this many threads,
+            which pays off on network or otherwise slow file systems.
+        onerror (callable, optional): Called with the OSError of unreadable entries,
+            which are skipped.
+
+    Example:
+    for path, size in scan_files("/data", extensions=[".xml"]):
+        print(path, size)
+    """
+    if extensions:
+        extensions = tuple(extension.lower() for extension in extensions)
+    scan = partial(_scan_directory, pattern=pattern, extensions=extensions,
+                   follow_symlinks=follow_symlinks, onerror=onerror)
+    if not workers:
+        pending = [root]
+        while pending:
+            files, subdirectories = scan(pending.pop())
+            yield from files
+            pending.extend(reversed(subdirectories))
+        return
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        running = {executor.submit(scan, root)}
+        while running:
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                files, subdirectories = future.result()
+                running.update(executor.submit(scan, subdirectory) for subdirectory in subdirectories)
+                yield from files
+
+
+class DirectorySizeSummary:
+    """Aggregated sizes of a file stream: totals, per-directory totals and the
+    top-N largest files, kept in a heap so memory does not grow with the number of files.
+
+    Attributes:
+        root (str): The scanned directory, where recursive_totals stops rolling up.
+        total_size (int): The total size of all files in bytes.
+        file_count (int): The number of files.
+        directories (dict): directory -> [size, count] of the files directly in it.
+    """
+    def __init__(self, top_n=10, root=None):
+        self.top_n = top_n
+        self.root = root
+        self.total_size = 0
+        self.file_count = 0
+        self.directories = defaultdict(lambda: [0, 0])
+        self._largest = []
+
+    def add(self, path, size):
+        self.total_size += size
+        self.file_count += 1
+        directory = self.directories[os.path.dirname(path)]
+        directory[0] += size
+        directory[1] += 1
+        if len(self._largest) < self.top_n:
+            heapq.heappush(self._largest, (size, path))
+        elif size > self._largest[0][0]:
+            heapq.heapreplace(self._largest, (size, path))
+
+    def largest_files(self):
+        """Return the top-N largest files as (path, size), largest first."""
+        return [(path, size) for size, path in sorted(self._largest, reverse=True)]
+
+    def recursive_totals(self):
+        """Return directory -> total size in bytes including all its subdirectories,
+        for the directories up to the root (up to the file system root without one)."""
+        root = os.path.normpath(self.root) if self.root is not None else None
+        totals = defaultdict(int)
+        for directory, (size, _) in self.directories.items():
+            while True:
+                totals[directory] += size
+                parent = os.path.dirname(directory)
+                if parent == directory or not parent or os.path.normpath(directory) == root:
+                    break
+                directory = parent
+        return dict(totals)
+
+
+def summarize_directory_sizes(root: str, top_n=10, **scan_options) -> DirectorySizeSummary:
+    """Scan a directory tree (see scan_files for the options) and aggregate the file
+    sizes while streaming, without building a list of all files.
+
+    Example:
+    summary = summarize_directory_sizes("/data", top_n=5, workers=8)
+    print(summary.total_size, summary.largest_files())
+    """
+    summary = DirectorySizeSummary(top_n, root)
+    for path, size in scan_files(root, **scan_options):
+        summary.add(path, size)
+    return summary
+
+
+def _get_io_executor() -> ThreadPoolExecutor:
+    """Return the bounded thread pool shared by the async I/O functions, created on first use."""
+    global _io_executor
+    with _io_executor_lock:
+        if _io_executor is None:
+            _io_executor = ThreadPoolExecutor(max_workers=IO_EXECUTOR_WORKERS, thread_name_prefix="async-io")
+        return _io_executor
+
+
+async def run_in_io_executor(func, *args, **kwargs):
+    """Run a blocking function in the shared I/O thread pool without blocking the event loop."""
+    # asyncio is only needed by the async functions
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_io_executor(), partial(func, *args, **kwargs))
+
+
+async def aread_file(file_path: str) -> str:
+    """Read a file in the shared I/O thread pool and return its contents as a string.
+
+    Example:
+    content = await aread_file("report.txt")
+    """
+    return await run_in_io_executor(read_file, file_path)
+
+
+async def awrite_file(file_path: str, content: str, atomic=False):
+    """Write a string to a file in the shared I/O thread pool (atomically with atomic=True).
+
+    Example:
+    await awrite_file("report.txt", "done")
+    """
+    await run_in_io_executor(write_file_atomic if atomic else write_file, file_path, content)
+
+
+async def gather_read(file_paths, concurrency=16) -> list:
+    """Read many files concurrently, at most `concurrency` at a time, and return their
+    contents in the order of file_paths.
+
+    Example:
+    contents = await gather_read(["a.txt", "b.txt"], concurrency=8)
+    """
+    import asyncio
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _read(file_path):
+        async with semaphore:
+            return await aread_file(file_path)
+
+    return await asyncio.gather(*(_read(file_path) for file_path in file_paths))
@@ -1,15 +1,555 @@
 #!/usr/bin/env python3
 
 import os
+import gzip
+import json
+import time
+import uuid
+import atexit
+import base64
+import hashlib
 import logging
+import tempfile
+import threading
+from datetime import date, datetime, timezone
 
-# PlotlyGraphDrawer
-from plotly.subplots import make_subplots
-import plotly.graph_objects as go
-import plotly.io as pio
-# PltGraphDrawer
-import matplotlib.pyplot as plt
-import matplotlib.dates as md
+import numpy as np
+
+
+# The plotting backends are imported on first use, so importing this module stays
+# cheap and only the backend actually used gets loaded.
+def _import_plotly():
+    """Import the Plotly modules used by PlotlyGraphDrawer as module globals."""
+    global plotly, get_plotlyjs, get_plotlyjs_version, make_subplots, go, pio
+    if 'go' in globals():
+        return
+    import plotly
+    import plotly.utils
+    from plotly.offline import get_plotlyjs, get_plotlyjs_version
+    from plotly.subplots import make_subplots
+    import plotly.graph_objects as go
+    import plotly.io as pio
+
+
+def _import_matplotlib():
+    """Import the Matplotlib modules used by PltGraphDrawer as module globals.
+
+    Figures are drawn on an explicit Agg canvas, so this is headless and never
+    initializes pyplot or a GUI backend.
+    """
+    global matplotlib, md, FigureCanvasAgg, Figure
+    if 'Figure' in globals():
+        return
+    import matplotlib
+    import matplotlib.dates as md
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+
+# Lazily imported names -> their loader, for access from outside the module
+_LAZY_IMPORTS = {
+    **dict.fromkeys(("plotly", "get_plotlyjs", "get_plotlyjs_version", "make_subplots", "go", "pio"),
+                    _import_plotly),
+    **dict.fromkeys(("matplotlib", "md", "FigureCanvasAgg", "Figure"), _import_matplotlib),
+}
+
+
+def __getattr__(name):
+    loader = _LAZY_IMPORTS.get(name)
+    if loader is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    loader()
+    return globals()[name]
+
+
+def _numeric_x(x_data):
+    """Return x as a float array usable for geometry: numbers as they are, datetimes
+    as nanoseconds, anything else (e.g. strings) as positions."""
+    x = np.asarray(x_data)
+    if x.dtype.kind == 'O':
+        try:
+            x = x.astype('datetime64[ns]')
+        except (TypeError, ValueError):
+            return np.arange(len(x), dtype=float)
+    if x.dtype.kind in 'Mm':
+        return x.view('int64').astype(float)
+    if x.dtype.kind in 'iuf':
+        return x.astype(float)
+    return np.arange(len(x), dtype=float)
+
+
+def lttb_indices(x, y, n_out):
+    """Select n_out point indices with Largest-Triangle-Three-Buckets.
+
+    The first and last points are kept; from every bucket in between the point
+    forming the largest triangle with the previously selected point and the
+    average of the next bucket is kept. The selection within a bucket is vectorized.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    edges = (np.arange(n_out - 1) * (n - 2) / (n_out - 2)).astype(int) + 1
+    edges[-1] = n - 1
+    # Averages of every bucket, plus the last point as the final "next bucket"
+    sums_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1)
+    sums_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1)
+    counts = np.diff(edges)
+    avg_x = np.append(sums_x / counts, x[-1])
+    avg_y = np.append(sums_y / counts, y[-1])
+
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    selected = 0
+    for bucket in range(n_out - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        ax, ay = x[selected], y[selected]
+        areas = np.abs((ax - avg_x[bucket + 1]) * (y[start:end] - ay)
+                       - (ax - x[start:end]) * (avg_y[bucket + 1] - ay))
+        selected = start + int(np.argmax(areas))
+        indices[bucket + 1] = selected
+    return indices
+
+
+def minmax_indices(x, y, n_out):
+    """Select up to n_out point indices keeping the minimum and maximum of each of
+    (n_out - 2) // 2 equally sized buckets, plus the first and last points, which
+    preserves spikes. Fully vectorized. Below four points there is no room for a
+    bucket, so only the first/last points (n_out < 3) or lttb_indices are used."""
+    n = len(y)
+    if n_out >= n:
+        return np.arange(n)
+    if n_out < 3:
+        return np.array([0, n - 1][:max(n_out, 0)], dtype=np.int64)
+    if n_out < 4:
+        return lttb_indices(x, y, n_out)
+    n_buckets = (n_out - 2) // 2
+    size = -(-n // n_buckets)
+    padded = np.full(n_buckets * size, np.nan)
+    padded[:n] = y
+    buckets = padded.reshape(n_buckets, size)
+    offsets = np.arange(n_buckets) * size
+    mins = np.argmin(np.where(np.isnan(buckets), np.inf, buckets), axis=1) + offsets
+    maxs = np.argmax(np.where(np.isnan(buckets), -np.inf, buckets), axis=1) + offsets
+    indices = np.unique(np.concatenate(([0, n - 1], mins, maxs)))
+    return indices[indices < n]
+
+
+# Downsampling methods: name -> function(x, y, n_out) returning the indices to keep
+DOWNSAMPLERS = {
+    "lttb": lttb_indices,
+    "minmax": minmax_indices,
+}
+
+
+class _Downsampler:
+    """Reduces line data to about points_per_pixel points per horizontal pixel before
+    rendering and keeps stats on the points dropped.
+
+    method is a name in DOWNSAMPLERS, a function(x, y, n_out) -> indices, or None to
+    disable it. A line is left untouched if its data has "downsample": False.
+    """
+    def __init__(self, method="lttb", points_per_pixel=1):
+        if isinstance(method, str):
+            if method not in DOWNSAMPLERS:
+                raise ValueError(f"Unknown downsampling method: {method}")
+            method = DOWNSAMPLERS[method]
+        self.method = method
+        self.points_per_pixel = points_per_pixel
+        self.stats = {"lines": 0, "points_in": 0, "points_out": 0, "points_dropped": 0}
+
+    def __call__(self, line_data, x_data, y_data, width_px):
+        n_out = int(width_px * self.points_per_pixel)
+        if self.method is None or not line_data.get("downsample", True) or len(x_data) <= n_out:
+            return x_data, y_data
+        y = np.asarray(y_data, dtype=float)
+        indices = self.method(_numeric_x(x_data), y, n_out)
+        self.stats["lines"] += 1
+        self.stats["points_in"] += len(y)
+        self.stats["points_out"] += len(indices)
+        self.stats["points_dropped"] += len(y) - len(indices)
+        return np.asarray(x_data)[indices], y[indices]
+
+
+
+class SeriesBuffer:
+    """The x/y values of one streamed series in preallocated NumPy arrays that
+    double in size when full.
+
+    With max_points, a full buffer is instead reduced to max_points // 2 points
+    with a DOWNSAMPLERS method, so memory stays bounded however long the input is.
+    To keep the density even over the whole series, later points are then stored
+    at the density of the reduced buffer: each group of incoming points, as many
+    as the stored points already stand for, is stored as its minimum and maximum.
+
+    The x dtype is chosen from the first value: datetime64[ms] for datetimes and
+    date strings (converted to UTC if they carry an offset), float64 for numbers
+    (and numeric strings, as found in CSV files).
+    """
+    def __init__(self, capacity=1024, max_points=None, downsample="minmax"):
+        if max_points:
+            capacity = min(capacity, max_points)
+        self.max_points = max_points
+        self.method = DOWNSAMPLERS[downsample] if isinstance(downsample, str) else downsample
+        self.x = None
+        self.y = np.empty(capacity)
+        self.size = 0
+        self.points_seen = 0
+        # Number of input points the stored points stand for
+        self._points_stored = 0
+        # Input points per group reduced to its min and max; 1 stores every point
+        self._group_size = 1
+        # The pending group: [count, (index, x, y) of the minimum, (index, x, y) of the maximum]
+        self._group = [0, None, None]
+
+    @staticmethod
+    def _x_dtype(value):
+        if isinstance(value, (int, float, np.number)):
+            return np.float64
+        if isinstance(value, str):
+            try:
+                float(value)
+                return np.float64
+            except ValueError:
+                pass
+        return 'datetime64[ms]'
+
+    @staticmethod
+    def _utc_datetime(value):
+        """Return aware datetimes and ISO strings with an offset as naive UTC datetimes,
+        as NumPy datetime64 has no time zones; other values unchanged."""
+        if isinstance(value, str):
+            if value[-1:] != 'Z' and value[-6:-5] not in ('+', '-') and value[-5:-4] not in ('+', '-'):
+                return value
+            value = datetime.fromisoformat(value)
+        if isinstance(value, datetime) and value.tzinfo is not None:
+            return value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+    def append(self, x_value, y_value):
+        if self.x is None:
+            self.x = np.empty(len(self.y), dtype=self._x_dtype(x_value))
+        if self.x.dtype.kind == 'M':
+            x_value = self._utc_datetime(x_value)
+        y_value = float(y_value)
+        self.points_seen += 1
+        if self._group_size == 1:
+            self._store(x_value, y_value, 1)
+            return
+
+        group = self._group
+        point = (self.points_seen, x_value, y_value)
+        if group[0] == 0:
+            group[1] = group[2] = point
+        elif y_value < group[1][2]:
+            group[1] = point
+        elif y_value > group[2][2]:
+            group[2] = point
+        group[0] += 1
+        if group[0] == self._group_size:
+            self._flush_group()
+
+    def _group_points(self):
+        """Return the (index, x, y) points kept from the pending group, in input order."""
+        count, minimum, maximum = self._group
+        if not count:
+            return []
+        return [minimum] if minimum is maximum else sorted((minimum, maximum), key=lambda point: point[0])
+
+    def _flush_group(self):
+        count = self._group[0]
+        for position, (_, x_value, y_value) in enumerate(self._group_points()):
+            # The group's input points are counted with its first stored point
+            self._store(x_value, y_value, count if position == 0 else 0)
+        self._group = [0, None, None]
+
+    def _store(self, x_value, y_value, points):
+        if self.size == len(self.y):
+            self._make_room()
+        self.x[self.size] = x_value
+        self.y[self.size] = y_value
+        self.size += 1
+        self._points_stored += points
+
+    def _make_room(self):
+        size = self.size
+        if self.max_points and size >= self.max_points:
+            keep = self.method(_numeric_x(self.x[:size]), self.y[:size], self.max_points // 2)
+            kept = len(keep)
+            self.x[:kept], self.y[:kept] = self.x[keep], self.y[keep]
+            self.size = kept
+            # Groups of the new points get as many input points per stored point as the buffer has
+            self._group_size = max(2, round(2 * self._points_stored / kept))
+            return
+        capacity = size * 2 if not self.max_points else min(size * 2, self.max_points)
+        self.x = np.resize(self.x, capacity)
+        self.y = np.resize(self.y, capacity)
+
+    def arrays(self):
+        """Return copies of the buffered x and y values (including the pending group),
+        trimmed to their size."""
+        if self.x is None:
+            return np.empty(0), np.empty(0)
+        points = self._group_points()
+        x_data = np.concatenate((self.x[:self.size], np.array([point[1] for point in points], dtype=self.x.dtype)))
+        y_data = np.concatenate((self.y[:self.size], [point[2] for point in points]))
+        return x_data, y_data
+
+
+def iter_records(file_path, file_format=None):
+    """Lazily yield the records (dicts) of a JSON Lines or CSV file. The format is
+    taken from the file extension unless given ("jsonl" or "csv"); CSV values are strings."""
+    file_format = file_format or os.path.splitext(file_path)[1].lstrip('.').lower()
+    if file_format in ("jsonl", "ndjson"):
+        # Imported here: json_utils is only needed for streamed input
+        from json_utils import iter_jsonl
+        yield from iter_jsonl(file_path)
+    elif file_format == "csv":
+        import csv
+        with open(file_path, 'r', encoding='utf-8', newline='') as file:
+            yield from csv.DictReader(file)
+    else:
+        raise ValueError(f"Unknown record file format: {file_format}")
+
+
+def stream_series(records, x, y, series=None, max_points=None, downsample="minmax"):
+    """Group streamed records into one SeriesBuffer per (series key, y field).
+
+    Args:
+        records (iterable of dict): The records, e.g. from iter_records.
+        x (str): The field of the x values.
+        y (str or list of str): The field(s) of the y values.
+        series (str, tuple of str or callable, optional): The field(s) identifying the
+            series of a record, or a function(record) returning the series key.
+            Without it, all records form one series (key None).
+        max_points (int, optional): Bound each series, see SeriesBuffer.
+        downsample (str or callable): The DOWNSAMPLERS method used with max_points.
+
+    Records missing a value (or with an empty one) are skipped for that field.
+
+    Returns:
+        dict: (series key, y field) -> SeriesBuffer, in the order of first appearance.
+    """
+    y_fields = [y] if isinstance(y, str) else list(y)
+    if series is None:
+        series_key = lambda record: None
+    elif isinstance(series, str):
+        series_key = lambda record: record.get(series)
+    elif isinstance(series, (tuple, list)):
+        series_key = lambda record: tuple(record.get(field) for field in series)
+    else:
+        series_key = series
+
+    buffers = {}
+    for record in records:
+        x_value = record.get(x)
+        if x_value is None or x_value == '':
+            continue
+        key = series_key(record)
+        for field in y_fields:
+            y_value = record.get(field)
+            if y_value is None or y_value == '':
+                continue
+            buffer = buffers.get((key, field))
+            if buffer is None:
+                buffer = buffers[(key, field)] = SeriesBuffer(max_points=max_points, downsample=downsample)
+            buffer.append(x_value, y_value)
+    return buffers
+
+
+def plot_file(drawer, file_path, x, y, series=None, file_format=None, max_points=None, downsample="minmax"):
+    """Stream a JSON Lines or CSV file into a PlotlyGraphDrawer or PltGraphDrawer:
+    one subplot per y field, with one line per series. Only the buffered series
+    are held in memory, never the whole file; with max_points, memory stays
+    proportional to the plotted output.
+
+    See stream_series for the arguments. Returns the drawer.
+
+    Example:
+        drawer = PlotlyGraphDrawer(title="Node metrics")
+        plot_file(drawer, "metrics.jsonl", x="timestamp", y=["cpu", "memory"], series="host",
+                  max_points=20000)
+        drawer.draw_graph()
+        drawer.save_figure("metrics")
+    """
+    buffers = stream_series(iter_records(file_path, file_format), x, y, series, max_points, downsample)
+    y_fields = [y] if isinstance(y, str) else list(y)
+    for field in y_fields:
+        lines = []
+        for (key, buffer_field), buffer in buffers.items():
+            if buffer_field != field:
+                continue
+            x_data, y_data = buffer.arrays()
+            label = ' '.join(map(str, key)) if isinstance(key, tuple) else ('' if key is None else str(key))
+            lines.append({"x": x_data, "y": y_data, "label": label})
+        drawer.add_subplot_data({"title": field, "y_label": field, "data": lines})
+    return drawer
+
+
+def plan_subplot_layout(num_plots, subplots_layout=None):
+    """Map subplot data to grid cells; the layout planner shared by both drawers.
+
+    Subplot data are placed in row-major order (left to right, then top to bottom)
+    into an (nrow, ncol) grid, by default one column with one row per subplot.
+    Only filled cells are returned, so trailing cells of a sparse grid stay empty.
+
+    Returns:
+        tuple: (nrow, ncol, cells) where cells is a list of (plot_index, row, col)
+        with 1-based row and col.
+
+    Example:
+        plan_subplot_layout(5, (2, 3))
+        # (2, 3, [(0, 1, 1), (1, 1, 2), (2, 1, 3), (3, 2, 1), (4, 2, 2)])
+    """
+    if subplots_layout:
+        nrow, ncol = subplots_layout
+    else:
+        nrow, ncol = num_plots, 1
+    if num_plots > nrow * ncol:
+        raise ValueError(f"{num_plots} subplots do not fit into a {nrow}x{ncol} layout")
+    cells = [(index, index // ncol + 1, index % ncol + 1) for index in range(num_plots)]
+    return nrow, ncol, cells
+
+
+def _hash_value(hasher, value):
+    """Feed a plot spec value into a hash in a stable, type-tagged way. Numeric
+    lists and NumPy arrays are hashed as raw bytes, so equal data hash equally
+    whether it is given as a list or as an array."""
+    if isinstance(value, dict):
+        hasher.update(b'd%d' % len(value))
+        for key in sorted(value, key=str):
+            _hash_value(hasher, str(key))
+            _hash_value(hasher, value[key])
+    elif isinstance(value, (list, tuple, np.ndarray)):
+        array = np.asarray(value) if len(value) else np.empty(0)
+        if array.dtype.kind in "biufcmM" and array.ndim == 1:
+            array = np.ascontiguousarray(array)
+            hasher.update(b'a' + array.dtype.str.encode() + b'%d' % len(array))
+            hasher.update(array.view(np.uint8))
+        else:
+            hasher.update(b'l%d' % len(value))
+            for item in value:
+                _hash_value(hasher, item)
+    elif isinstance(value, (datetime, date)):
+        hasher.update(b't' + value.isoformat().encode())
+    elif callable(value):
+        hasher.update(b'f' + f"{value.__module__}.{value.__qualname__}".encode())
+    else:
+        text = repr(value).encode()
+        hasher.update(b's' + type(value).__name__.encode() + b'%d:' % len(text) + text)
+
+
+class FigureCache:
+    """
+    A content-addressed on-disk cache of saved figures.
+
+    Figures are stored under a hash of their plot spec (subplot data, layout,
+    title, figsize, extension, ...), so a figure whose input did not change is
+    copied from the cache instead of being drawn and rendered again. Entries are
+    written atomically, and the least recently used ones are evicted once the
+    cache grows beyond max_bytes. The cache directory can be shared by several
+    processes: the files themselves are the index, with their mtime as LRU time.
+
+    Example:
+        cache = FigureCache("/var/cache/report-figures", max_bytes=256 * 1024 ** 2)
+        drawer = PltGraphDrawer(title="CPU", cache=cache)
+        drawer.add_subplot_data({"data": [{"x": x, "y": y}]})
+        drawer.save_figure("cpu")   # drawn and rendered on a miss only
+        print(cache.stats())        # {'hits': 0, 'misses': 1, 'evictions': 0, 'hit_ratio': 0.0}
+    """
+    def __init__(self, directory, max_bytes=512 * 1024 ** 2):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def __getstate__(self):
+        # Picklable for render_batch workers; each process counts on its own
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(spec) -> str:
+        """Return the hex digest identifying a plot spec."""
+        hasher = hashlib.blake2b(digest_size=20)
+        _hash_value(hasher, spec)
+        return hasher.hexdigest()
+
+    def _entry_path(self, key, suffix):
+        return os.path.join(self.directory, key + suffix)
+
+    def get(self, key, file_path) -> bool:
+        """Copy the cached figure of key to file_path and return True, or return False on a miss."""
+        suffix = _file_suffix(file_path)
+        entry_path = self._entry_path(key, suffix)
+        try:
+            # Mark the entry as recently used
+            os.utime(entry_path)
+            _copy_file_atomic(entry_path, file_path)
+        except FileNotFoundError:
+            # Not cached, or evicted by another process in between
+            with self._lock:
+                self.misses += 1
+            return False
+        with self._lock:
+            self.hits += 1
+        return True
+
+    def put(self, key, file_path):
+        """Store a copy of the saved figure file_path under key, then evict old entries if needed."""
+        _copy_file_atomic(file_path, self._entry_path(key, _file_suffix(file_path)))
+        self._evict()
+
+    def _evict(self):
+        entries, total_size = [], 0
+        with os.scandir(self.directory) as directory_entries:
+            for entry in directory_entries:
+                if entry.name.startswith('.') or not entry.is_file():
+                    continue
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total_size += stat.st_size
+        if total_size <= self.max_bytes:
+            return
+        for _, size, path in sorted(entries):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            with self._lock:
+                self.evictions += 1
+            total_size -= size
+            if total_size <= self.max_bytes:
+                break
+
+    def clear(self):
+        """Remove all cached figures."""
+        for name in os.listdir(self.directory):
+            os.remove(os.path.join(self.directory, name))
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "hit_ratio": self.hits / lookups if lookups else 0.0}
+
+
+def _file_suffix(file_path):
+    """Return the full suffix of a file name, e.g. ".html.gz"."""
+    name = os.path.basename(file_path)
+    return name[name.find('.'):] if '.' in name else ''
+
+
+def _copy_file_atomic(source_path, file_path):
+    # file_utils is only needed by the figure cache
+    from file_utils import copy_file_atomic
+    copy_file_atomic(source_path, file_path)
 
 
 class PlotlyGraphDrawer:
@@ -18,13 +558,28 @@ class PlotlyGraphDrawer:
     and saving the figures in HTML or PNG format.
     """
     def __init__(self, **kwargs):
+        _import_plotly()
         self.logger = logging.getLogger("Graph Drawer")
         self.images_directory = kwargs.get("images_directory", os.getcwd())
         self.fig_title = kwargs.get("title")
         self.subplots_layout = kwargs.get("subplots_layout")
+        # (nrow, ncol) of the drawn figure; subplots_layout keeps the setting
+        self._grid = None
         self.figsize = kwargs.get("figsize", (800, 600))
+        # Plotly's make_subplots values: False, True (per column/row) or "all"
+        self.shared_xaxes = kwargs.get("shared_xaxes", False)
+        self.shared_yaxes = kwargs.get("shared_yaxes", False)
+        # Lines with more raw points than this are drawn with go.Scattergl (WebGL); the
+        # count is taken before downsampling, which keeps such lines in the WebGL path
+        self.webgl_threshold = kwargs.get("webgl_threshold", 10000)
+        # Lines are downsampled to the figure width ("lttb", "minmax", a function or None)
+        self.downsampler = _Downsampler(kwargs.get("downsample", "lttb"), kwargs.get("points_per_pixel", 1))
+        # A FigureCache consulted by save_figure
+        self.cache = kwargs.get("cache")
         self.fig = None
         self.data = []
+        # id(line data) -> index of its trace in self.fig.data
+        self._trace_indices = {}
 
     def add_subplot_data(self, plot_data: list):
         self.data.append(plot_data)
@@ -44,59 +599,257 @@ class PlotlyGraphDrawer:
         plot_data["data"].append(line_data)
 
     def _init_subplots(self):
-        if self.subplots_layout:
-            nrow, ncol = self.subplots_layout
-        else:
-            num_subplots = len(self.data)
-            nrow, ncol = num_subplots, 1
-            self.subplots_layout = (nrow, ncol)
+        nrow, ncol, cells = plan_subplot_layout(len(self.data), self.subplots_layout)
+        self._grid = (nrow, ncol)
 
+        # Empty cells get no axes at all
+        specs = [[None] * ncol for _ in range(nrow)]
+        for _, row, col in cells:
+            specs[row - 1][col - 1] = {}
         subplot_titles = tuple(plot_data.get("title", '') for plot_data in self.data)
-        self.fig = make_subplots(rows=nrow, cols=ncol, subplot_titles=subplot_titles)
+        self.fig = make_subplots(rows=nrow, cols=ncol, specs=specs, subplot_titles=subplot_titles,
+                                 shared_xaxes=self.shared_xaxes, shared_yaxes=self.shared_yaxes)
+        return cells
 
-    def draw_subplot(self, plot_data, row, col):
-        # create line plots
+    def _build_traces(self, plot_data):
+        """Create the line traces of a subplot as (line data, trace) pairs. The x/y data
+        may be lists or NumPy arrays; lines with more points than self.webgl_threshold
+        (counted before downsampling) are rendered with WebGL."""
         traces = []
         for line_data in plot_data.get("data", []):
             x_data = line_data.get('x', [])
             y_data = line_data.get('y', [])
-            if not x_data or not y_data:
+            if len(x_data) == 0 or len(y_data) == 0:
                 self.logger.warning("No plot data for %s", line_data)
                 continue
+            use_webgl = len(x_data) > self.webgl_threshold
+            ncol = self._grid[1] if self._grid else 1
+            x_data, y_data = self.downsampler(line_data, x_data, y_data, self.figsize[0] / ncol)
             label = line_data.get("label", '')
-            scatter = go.Scatter(x=x_data, y=y_data, name=label, mode="lines")
-            traces.append(scatter)
+            trace_class = go.Scattergl if use_webgl else go.Scatter
+            traces.append((line_data, trace_class(x=x_data, y=y_data, name=label, mode="lines")))
+        return traces
 
-        # add lines to the subplot
-        for trace in traces:
-            self.fig.append_trace(trace, row=row, col=col)
+    def draw_subplot(self, plot_data, row, col):
+        # create line plots and add them to the subplot in one batch
+        traces = self._build_traces(plot_data)
+        for offset, (line_data, _) in enumerate(traces):
+            self._trace_indices[id(line_data)] = len(self.fig.data) + offset
+        if traces:
+            self.fig.add_traces([trace for _, trace in traces], rows=row, cols=col)
 
         yaxis_label = plot_data.get("y_label")
         if yaxis_label:
             self.fig.update_yaxes(title_text=yaxis_label, row=row, col=col)
 
     def draw_graph(self):
-        self._init_subplots()
+        cells = self._init_subplots()
 
-        for row in range(self.subplots_layout[0]):
-            for col in range(self.subplots_layout[1]):
-                plot_index = col * self.subplots_layout[1] + row
-                self.draw_subplot(self.data[plot_index], row + 1, col + 1)
+        # Collect the traces of all subplots and add them to the figure in one batch
+        traces, rows, cols = [], [], []
+        self._trace_indices = {}
+        for plot_index, row, col in cells:
+            plot_data = self.data[plot_index]
+            for line_data, trace in self._build_traces(plot_data):
+                self._trace_indices[id(line_data)] = len(traces)
+                traces.append(trace)
+                rows.append(row)
+                cols.append(col)
+            yaxis_label = plot_data.get("y_label")
+            if yaxis_label:
+                self.fig.update_yaxes(title_text=yaxis_label, row=row, col=col)
+        if traces:
+            self.fig.add_traces(traces, rows=rows, cols=cols)
 
         self.fig.update_layout(
             showlegend=True,
             title_text=self.fig_title)
 
-    def save_figure(self, file_name="test", extension="html"):
+    def append_points(self, x_data, y_data, subplot_index=-1, line_index=-1, max_points=None):
+        """Append new points to a line of an already drawn figure without rebuilding it.
+
+        Args:
+            x_data, y_data: The new points (lists or NumPy arrays).
+            subplot_index (int): The index of the subplot in self.data.
+            line_index (int): The index of the line in the subplot's data.
+            max_points (int, optional): Keep only the latest max_points points (sliding window).
+        """
+        if self.fig is None:
+            self.logger.error("No figure available. Please draw it with draw_graph() method first")
+            return
+        line_data = self.data[subplot_index]["data"][line_index]
+        trace_index = self._trace_indices.get(id(line_data))
+        if trace_index is None:
+            self.logger.error("The line has not been drawn: subplot %s, line %s", subplot_index, line_index)
+            return
+
+        x_all = np.concatenate((np.asarray(line_data['x']), np.asarray(x_data)))
+        y_all = np.concatenate((np.asarray(line_data['y']), np.asarray(y_data)))
+        if max_points:
+            x_all, y_all = x_all[-max_points:], y_all[-max_points:]
+        line_data['x'], line_data['y'] = x_all, y_all
+        ncol = self._grid[1] if self._grid else 1
+        x_all, y_all = self.downsampler(line_data, x_all, y_all, self.figsize[0] / ncol)
+        with self.fig.batch_update():
+            trace = self.fig.data[trace_index]
+            trace.x, trace.y = x_all, y_all
+
+    def _cache_spec(self, **options):
+        """Return everything the saved file depends on, for the figure cache key."""
+        return {"drawer": "plotly", "data": self.data, "title": self.fig_title,
+                "subplots_layout": plan_subplot_layout(len(self.data), self.subplots_layout)[:2],
+                "figsize": self.figsize,
+                "shared_xaxes": self.shared_xaxes, "shared_yaxes": self.shared_yaxes,
+                "webgl_threshold": self.webgl_threshold, "downsample": self.downsampler.method,
+                "points_per_pixel": self.downsampler.points_per_pixel, **options}
+
+    def save_figure(self, file_name="test", extension="html", compact=False, compress=False):
+        """Save the figure as HTML or PNG and return the file path.
+
+        With a cache, an unchanged figure is copied from the cache instead of
+        being rendered, and a figure that has not been drawn yet is only drawn on
+        a cache miss.
+
+        Args:
+            compact (bool): For HTML, embed the numeric trace data as base64 typed
+                arrays instead of decimal JSON text, which is several times smaller.
+            compress (bool): For HTML, write a gzip-compressed file (".html.gz").
+        """
         if not os.path.exists(self.images_directory):
             os.makedirs(self.images_directory)
         file_path = os.path.join(self.images_directory, '.'.join([file_name, extension]))
 
+        cache_key = None
+        if self.cache is not None:
+            compress = compress and extension == "html"
+            cache_key = self.cache.key(self._cache_spec(extension=extension, compact=compact, compress=compress))
+            cached_path = file_path + '.gz' if compress else file_path
+            if self.cache.get(cache_key, cached_path):
+                return cached_path
+        if self.fig is None:
+            self.draw_graph()
+
         if extension == "html":
-            with open(file_path, 'w') as f:
-                f.write(pio.to_html(self.fig, include_plotlyjs='cdn', full_html=False))
+            if compact:
+                content = figures_to_html([self.fig], full_html=False)
+            else:
+                content = pio.to_html(self.fig, include_plotlyjs='cdn', full_html=False)
+            file_path = _write_html(file_path, content, compress)
         elif extension == "png":
+            _start_kaleido_server()
             self.fig.write_image(file_path, scale=3)
+        if cache_key is not None:
+            self.cache.put(cache_key, file_path)
+        return file_path
+
+
+# numpy dtype -> plotly.js typed array dtype
+_TYPED_ARRAY_DTYPES = {
+    "float64": "f8", "float32": "f4",
+    "int32": "i4", "uint32": "u4", "int16": "i2", "uint16": "u2", "int8": "i1", "uint8": "u1",
+}
+
+
+def _encode_typed_array(values):
+    """Return numeric 1-D data as a plotly.js base64 typed array, other data unchanged.
+    Integers are stored in the smallest integer type that holds them."""
+    array = np.asarray(values)
+    if array.ndim != 1 or array.dtype.kind not in 'iuf':
+        return values
+    if array.dtype.kind in 'iu':
+        low, high = (array.min(), array.max()) if array.size else (0, 0)
+        candidates = (np.uint8, np.uint16, np.uint32) if low >= 0 else (np.int8, np.int16, np.int32)
+        # plotly.js has no 64-bit integer arrays: fall back to float64
+        array = array.astype(next((dtype for dtype in candidates if np.iinfo(dtype).max >= high
+                                   and np.iinfo(dtype).min <= low), np.float64))
+    elif array.dtype.name not in _TYPED_ARRAY_DTYPES:
+        array = array.astype(np.float64)
+    array = np.ascontiguousarray(array, dtype=array.dtype.newbyteorder('<'))
+    return {"dtype": _TYPED_ARRAY_DTYPES[array.dtype.name],
+            "bdata": base64.b64encode(array.tobytes()).decode('ascii')}
+
+
+def _compact_figure_json(fig):
+    """Serialize a figure to JSON with its numeric trace data as base64 typed arrays."""
+    fig_json = fig.to_plotly_json()
+    for trace in fig_json["data"]:
+        for key in ("x", "y", "z"):
+            if key in trace and trace[key] is not None:
+                trace[key] = _encode_typed_array(trace[key])
+    return json.dumps({"data": fig_json["data"], "layout": fig_json.get("layout", {})},
+                      cls=plotly.utils.PlotlyJSONEncoder, separators=(',', ':'))
+
+
+def figures_to_html(figures, include_plotlyjs='cdn', full_html=True):
+    """Render one or more Plotly figures into a single HTML document (or fragment)
+    with compact typed-array trace data and one shared plotly.js include.
+
+    Args:
+        figures (list): plotly Figure objects.
+        include_plotlyjs: 'cdn' (script tag), True (embed the library) or False.
+        full_html (bool): Wrap the output in an <html> document.
+    """
+    _import_plotly()
+    parts = []
+    if include_plotlyjs == 'cdn':
+        parts.append(f'<script src="https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js"></script>')
+    elif include_plotlyjs:
+        parts.append(f'<script type="text/javascript">{get_plotlyjs()}</script>')
+    for fig in figures:
+        div_id = f"plot-{uuid.uuid4().hex}"
+        height = fig.layout.height or 600
+        parts.append(f'<div id="{div_id}" style="height:{height}px; width:100%;"></div>\n'
+                     f'<script type="text/javascript">(function() {{\n'
+                     f'var figure = {_compact_figure_json(fig)};\n'
+                     f'Plotly.newPlot("{div_id}", figure.data, figure.layout, {{"responsive": true}});\n'
+                     f'}})();</script>')
+    body = '\n'.join(parts)
+    if full_html:
+        return f'<html>\n<head><meta charset="utf-8" /></head>\n<body>\n{body}\n</body>\n</html>'
+    return body
+
+
+def _write_html(file_path, content, compress=False):
+    """Write HTML content, gzip-compressed to file_path + ".gz" if compress is set."""
+    if compress:
+        file_path += '.gz'
+        with gzip.open(file_path, 'wt', encoding='utf-8') as f:
+            f.write(content)
+    else:
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+    return file_path
+
+
+def save_figures_bundle(figures, file_path, include_plotlyjs='cdn', compress=False):
+    """Save several Plotly figures (or PlotlyGraphDrawer instances) into one HTML
+    file that loads plotly.js once. Returns the written file path.
+
+    Example:
+        save_figures_bundle([cpu_drawer, memory_drawer], "report.html", compress=True)
+    """
+    figures = [fig.fig if isinstance(fig, PlotlyGraphDrawer) else fig for fig in figures]
+    return _write_html(file_path, figures_to_html(figures, include_plotlyjs), compress)
+
+
+_kaleido_server_started = False
+
+
+def _start_kaleido_server():
+    """Start a persistent Kaleido (>= 1.0) renderer on first use, so PNG exports reuse
+    one browser instead of starting it per image. Older Kaleido versions keep their
+    renderer process alive on their own."""
+    global _kaleido_server_started
+    if _kaleido_server_started:
+        return
+    _kaleido_server_started = True
+    try:
+        import kaleido
+    except ImportError:
+        return
+    if hasattr(kaleido, "start_sync_server"):
+        kaleido.start_sync_server(silence_warnings=True)
+        atexit.register(kaleido.stop_sync_server, silence_warnings=True)
 
 
 class PltGraphDrawer:
@@ -105,29 +858,56 @@ class PltGraphDrawer:
     and saving the figures in PNG format.
     """
     def __init__(self, **kwargs):
+        _import_matplotlib()
         self.logger = logging.getLogger("Graph Drawer")
         self.data = []
         self.images_directory = kwargs.get("images_directory", os.getcwd())
         self.fig_title = kwargs.get("title")
         self.subplots_layout = kwargs.get('subplots_layout')
+        # (nrow, ncol) of the drawn figure; subplots_layout keeps the setting
+        self._grid = None
         self.figsize = kwargs.get("figsize", (20, 16))
+        # Same values as PlotlyGraphDrawer: False, True (per column/row) or "all"
+        self.shared_xaxes = kwargs.get("shared_xaxes", False)
+        self.shared_yaxes = kwargs.get("shared_yaxes", False)
+        self.dpi = 100
+        # Lines are downsampled to the figure width ("lttb", "minmax", a function or None)
+        self.downsampler = _Downsampler(kwargs.get("downsample", "lttb"), kwargs.get("points_per_pixel", 1))
+        # A FigureCache consulted by save_figure
+        self.cache = kwargs.get("cache")
         self.fig = None
         self.axes = None
 
-    def _set_figure_config(self):
-        plt.rcParams["figure.figsize"] = self.figsize
-        plt.rcParams["figure.titlesize"] = 20
-        plt.rcParams["legend.loc"] = "upper left"
-        plt.rcParams['figure.dpi'] = 100
+    def _figure_config(self):
+        """Return the rc parameters of the figure. They are applied with a
+        per-figure rc_context instead of changing the global rcParams."""
+        return {
+            "figure.figsize": self.figsize,
+            "figure.titlesize": 20,
+            "legend.loc": "upper left",
+            "figure.dpi": self.dpi,
+        }
 
     def _init_subplots(self):
-        if self.subplots_layout:
-            nrow, ncol = self.subplots_layout
-        else:
-            num_subplots = len(self.data)
-            nrow, ncol = num_subplots, 1
+        nrow, ncol, cells = plan_subplot_layout(len(self.data), self.subplots_layout)
+        self._grid = (nrow, ncol)
 
-        self.fig, self.axes = plt.subplots(nrow, ncol)
+        # Object-oriented Figure on an Agg canvas: no pyplot global state involved
+        self.fig = Figure(figsize=self.figsize, dpi=self.dpi)
+        FigureCanvasAgg(self.fig)
+        # Axes are created for the filled cells only, sharing the first axis
+        # of their column/row (or of the figure with "all") if requested
+        self.axes = []
+        x_anchors, y_anchors = {}, {}
+        for plot_index, row, col in cells:
+            x_key = "all" if self.shared_xaxes == "all" else col
+            y_key = "all" if self.shared_yaxes == "all" else row
+            ax = self.fig.add_subplot(nrow, ncol, plot_index + 1,
+                                      sharex=x_anchors.get(x_key) if self.shared_xaxes else None,
+                                      sharey=y_anchors.get(y_key) if self.shared_yaxes else None)
+            x_anchors.setdefault(x_key, ax)
+            y_anchors.setdefault(y_key, ax)
+            self.axes.append(ax)
 
         if self.fig_title:
             self.fig.suptitle(self.fig_title)
@@ -167,6 +947,8 @@ class PltGraphDrawer:
         for line_data in plot_data.get("data", []):
             x_data = line_data.get('x', [])
             y_data = line_data.get('y', [])
+            ncol = self._grid[1] if self._grid else 1
+            x_data, y_data = self.downsampler(line_data, x_data, y_data, self.figsize[0] * self.dpi / ncol)
             label = line_data.get("label", '')
             if label:
                 ax_label_exist = True
@@ -180,15 +962,131 @@ class PltGraphDrawer:
             ax.legend(bbox_to_anchor=(1, 1))
 
     def draw_graph(self):
-        self._set_figure_config()
-        self._init_subplots()
-        axes_list = self.fig.axes
-        for i, ax in enumerate(axes_list):
-            self.draw_subplot(ax, self.data[i])
+        with matplotlib.rc_context(self._figure_config()):
+            self._init_subplots()
+            for ax, plot_data in zip(self.axes, self.data):
+                self.draw_subplot(ax, plot_data)
+
+    def _cache_spec(self, **options):
+        """Return everything the saved image depends on, for the figure cache key."""
+        return {"drawer": "matplotlib", "data": self.data, "title": self.fig_title,
+                "subplots_layout": plan_subplot_layout(len(self.data), self.subplots_layout)[:2],
+                "figsize": self.figsize, "dpi": self.dpi,
+                "shared_xaxes": self.shared_xaxes, "shared_yaxes": self.shared_yaxes,
+                "downsample": self.downsampler.method,
+                "points_per_pixel": self.downsampler.points_per_pixel, **options}
 
     def save_figure(self, file_name="test", extension="png"):
-        self.fig.tight_layout()
-        self.fig.subplots_adjust(top=0.92, wspace=0.25)
+        """Save the figure and return the image path.
+
+        With a cache, an unchanged figure is copied from the cache instead of
+        being rendered, and a figure that has not been drawn yet is only drawn on
+        a cache miss.
+        """
         image_path = os.path.join(self.images_directory, '.'.join([file_name, extension]))
-        self.fig.savefig(image_path, bbox_inches="tight")
-        plt.close(self.fig)
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.key(self._cache_spec(extension=extension))
+            if self.cache.get(cache_key, image_path):
+                return image_path
+        if self.fig is None:
+            self.draw_graph()
+
+        with matplotlib.rc_context(self._figure_config()):
+            self.fig.tight_layout()
+            self.fig.subplots_adjust(top=0.92, wspace=0.25)
+            self.fig.savefig(image_path, bbox_inches="tight")
+        if cache_key is not None:
+            self.cache.put(cache_key, image_path)
+        return image_path
+
+
+def _render_spec(spec):
+    """Draw and save one PltGraphDrawer figure described by a spec (see render_batch)."""
+    spec = dict(spec)
+    data = spec.pop("data", [])
+    file_name = spec.pop("file_name", "test")
+    extension = spec.pop("extension", "png")
+    drawer = PltGraphDrawer(**spec)
+    for plot_data in data:
+        drawer.add_subplot_data(plot_data)
+    # save_figure draws the figure, unless a cache (spec "cache") already has it
+    return drawer.save_figure(file_name, extension)
+
+
+def _warm_up_render_worker():
+    """Pay the one-off costs (font cache, Agg renderer) once per worker process."""
+    _render_spec({"data": [{"data": [{"x": [0, 1], "y": [0, 1], "label": "warm-up"}]}],
+                  "images_directory": tempfile.gettempdir(), "file_name": f"warm-up-{os.getpid()}"})
+    os.remove(os.path.join(tempfile.gettempdir(), f"warm-up-{os.getpid()}.png"))
+
+
+_render_pool = None
+_render_pool_workers = None
+
+
+def _get_render_pool(workers):
+    """Return the shared render process pool, (re)creating it if the worker count changed,
+    so warmed-up workers are reused across render_batch calls."""
+    global _render_pool, _render_pool_workers
+    if _render_pool is None or _render_pool_workers != workers:
+        # Only loaded when a process pool is actually requested
+        from concurrent.futures import ProcessPoolExecutor
+        shutdown_render_pool()
+        _render_pool = ProcessPoolExecutor(max_workers=workers, initializer=_warm_up_render_worker)
+        _render_pool_workers = workers
+    return _render_pool
+
+
+def shutdown_render_pool():
+    """Shut down the worker processes used by render_batch."""
+    global _render_pool, _render_pool_workers
+    if _render_pool is not None:
+        _render_pool.shutdown()
+        _render_pool, _render_pool_workers = None, None
+
+
+def render_batch(specs, workers=None, chunksize=1):
+    """Render many PltGraphDrawer figures in parallel in a pool of worker processes.
+
+    Each spec is a dict with the PltGraphDrawer keyword arguments (title,
+    subplots_layout, figsize, images_directory, cache, ...) plus "data" (the list
+    of subplot data), "file_name" and "extension". The pool is kept alive between
+    calls; use shutdown_render_pool() to release it.
+
+    Args:
+        specs (iterable of dict): The figures to render.
+        workers (int, optional): The number of processes. Defaults to the CPU count;
+            1 renders serially in the current process.
+        chunksize (int): The number of specs sent to a worker at once.
+
+    Returns:
+        list: The paths of the saved images, in the order of specs.
+
+    Example:
+        specs = [{"data": [{"data": [{"x": x, "y": y}]}], "file_name": f"report_{i}"}
+                 for i, (x, y) in enumerate(series)]
+        paths = render_batch(specs, workers=8)
+    """
+    workers = workers or os.cpu_count()
+    if workers == 1:
+        return [_render_spec(spec) for spec in specs]
+    return list(_get_render_pool(workers).map(_render_spec, specs, chunksize=chunksize))
+
+
+if __name__ == "__main__":
+    # Benchmark render_batch throughput against rendering the figures serially
+    output_directory = tempfile.mkdtemp()
+    x = np.arange(10000)
+    specs = [{"data": [{"data": [{"x": x, "y": np.sin(x / (i + 1)), "label": "sin"}]}],
+              "images_directory": output_directory, "file_name": f"figure_{i}", "figsize": (8, 6)}
+             for i in range(64)]
+    for workers in sorted({1, os.cpu_count()}):
+        if workers > 1:
+            # Start and warm up the pool outside of the timed section
+            render_batch(specs[:workers], workers=workers)
+        start = time.perf_counter()
+        render_batch(specs, workers=workers)
+        elapsed = time.perf_counter() - start
+        print(f"workers={workers}: {len(specs) / elapsed:.1f} figures/s")
+    shutdown_render_pool()
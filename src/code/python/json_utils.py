@@ -1,5 +1,57 @@
+import re
 import json
 
+from decorators import memoize_file
+from file_utils import run_in_io_executor
+
+
+def _json_dumps(data) -> str:
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False)
+
+
+# The compact writers and iter_jsonl use orjson if it is installed, but only
+# where its result matches the standard library's: inputs orjson rejects or
+# would write differently go through json. What remains different is that
+# orjson formats some floats differently (1e20 instead of 1e+20, same value)
+# and also serializes types json rejects (datetime, UUID, dataclasses, NumPy).
+try:
+    import orjson
+
+    JSON_BACKEND = 'orjson'
+
+    def _dumps(data) -> str:
+        try:
+            content = orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # e.g. integers wider than 64 bits
+            return _json_dumps(data)
+        if b'null' in content:
+            # orjson writes NaN and Infinity as null, json as NaN and Infinity
+            return _json_dumps(data)
+        return content.decode('utf-8')
+
+    # orjson turns integers wider than 64 bits into floats: leave numbers of 19 and
+    # more digits to json (a digit run in a string only costs the slower path)
+    _LONG_NUMBER = re.compile(rb'[0-9]{19}')
+
+    def _loads(content: bytes):
+        if _LONG_NUMBER.search(content):
+            return json.loads(content)
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            # e.g. NaN, Infinity or lone surrogates, which json accepts
+            return json.loads(content)
+except ImportError:
+    JSON_BACKEND = 'json'
+    _dumps = _json_dumps
+    _loads = json.loads
+
+# Default read size for the incremental array reader (1 MiB)
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_NUMBER_PART = re.compile(r'[0-9eE.+-]+')
+
 
 def read_json(file_path: str):
     """Read a JSON file and return its contents as a Python dict.
@@ -11,12 +63,141 @@ def read_json(file_path: str):
         return json.load(file)
 
 
-def write_json(file_path: str, data):
+# read_json reusing the parsed data until the file's mtime or size change;
+# the returned objects are shared, so they must not be modified in place
+read_json_cached = memoize_file(read_json)
+
+
+def write_json(file_path: str, data, compact=False):
     """Write a Python dict to a JSON file.
 
+    By default the output is pretty-printed. With compact=True it is written
+    without any whitespace, with orjson where it gives the same result as json
+    (see above), which is considerably smaller and quicker to write.
+
     Example:
     data = {"name": "John", "age": 30}
     write_json("data.json", data)
+    write_json("data.min.json", data, compact=True)
     """
     with open(file_path, 'w', encoding='utf-8') as file:
-        json.dump(data, file, indent=4)
+        if compact:
+            file.write(_dumps(data))
+        else:
+            json.dump(data, file, indent=4)
+
+
+async def aread_json(file_path: str):
+    """Read a JSON file in the shared I/O thread pool without blocking the event loop.
+
+    Example:
+    data = await aread_json("data.json")
+    """
+    return await run_in_io_executor(read_json, file_path)
+
+
+async def awrite_json(file_path: str, data, compact=False):
+    """Write a Python dict to a JSON file in the shared I/O thread pool.
+
+    Example:
+    await awrite_json("data.json", {"name": "John"})
+    """
+    await run_in_io_executor(write_json, file_path, data, compact)
+
+
+def iter_jsonl(file_path: str):
+    """Lazily yield the records of a JSON Lines file, skipping blank lines.
+
+    Example:
+    for record in iter_jsonl("metrics.jsonl"):
+        print(record["name"])
+    """
+    with open(file_path, 'rb') as file:
+        for line in file:
+            if line.strip():
+                yield _loads(line)
+
+
+def write_jsonl(file_path: str, records, batch_size=1000, append=False) -> int:
+    """Write an iterable (e.g. a generator) of records to a JSON Lines file.
+
+    Records are serialized compactly and written batch_size lines at a time.
+
+    Returns:
+        int: The number of records written.
+
+    Example:
+    write_jsonl("metrics.jsonl", ({"id": i} for i in range(3)))  # 3
+    """
+    count = 0
+    batch = []
+    with open(file_path, 'a' if append else 'w', encoding='utf-8') as file:
+        for record in records:
+            batch.append(_dumps(record))
+            if len(batch) >= batch_size:
+                file.write('\n'.join(batch) + '\n')
+                count += len(batch)
+                batch.clear()
+        if batch:
+            file.write('\n'.join(batch) + '\n')
+            count += len(batch)
+    return count
+
+
+def iter_json_array(file_path: str, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Lazily yield the items of a JSON document whose top level is a list.
+
+    The file is read chunk_size characters at a time and items are decoded one
+    by one, so the list is never held in memory as a whole.
+
+    Example:
+    for item in iter_json_array("data.json"):
+        print(item)
+    """
+    decoder = json.JSONDecoder()
+    with open(file_path, 'r', encoding='utf-8') as file:
+        buffer, pos, eof = '', 0, False
+        state = 'start'
+        while True:
+            pos = _WHITESPACE.match(buffer, pos).end()
+            decoded = None
+            if pos < len(buffer) and state == 'value':
+                try:
+                    decoded = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    pass
+                # A value ending at the buffer end may continue in the next chunk, and
+                # so may a number followed only by the start of its fraction or exponent
+                # ("-25." of "-25.0"), which raw_decode returns without it
+                if decoded is not None and not eof and (
+                        decoded[1] == len(buffer) or _NUMBER_PART.fullmatch(buffer, decoded[1])):
+                    decoded = None
+            if pos == len(buffer) or (state == 'value' and decoded is None):
+                if eof:
+                    raise ValueError(f"Invalid or truncated JSON array in {file_path}")
+                chunk = file.read(chunk_size)
+                buffer, pos, eof = buffer[pos:] + chunk, 0, not chunk
+                continue
+
+            char = buffer[pos]
+            if state == 'start':
+                if char != '[':
+                    raise ValueError(f"The top level of {file_path} is not a JSON array")
+                pos += 1
+                state = 'first'
+            elif state == 'first' and char == ']':
+                return
+            elif state in ('first', 'value'):
+                if decoded is None:
+                    state = 'value'
+                    continue
+                item, pos = decoded
+                yield item
+                state = 'separator'
+            elif char == ',':
+                pos += 1
+                state = 'value'
+            elif char == ']':
+                return
+            else:
+                raise ValueError(f"Expected ',' or ']' between the items of {file_path}")
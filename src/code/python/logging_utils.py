@@ -1,5 +1,16 @@
 import sys
+import queue
+import atexit
 import logging
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+# Default name of the async logger; distinct from the console logger's, whose
+# synchronous stdout handler would otherwise also write every record
+ASYNC_LOGGER_NAME = f"{__name__}.async"
+# name -> (logger, listener) of the loggers set up by create_async_logger
+_async_loggers = {}
+_async_loggers_lock = threading.Lock()
 
 
 def create_console_logger():
@@ -8,7 +19,8 @@ def create_console_logger():
 
     The logger is set to the DEBUG level, and a StreamHandler is added to output
     log messages to the console (stdout). The handler is also configured to use
-    the DEBUG level.
+    the DEBUG level. Calling the function again returns the same logger without
+    adding another handler, so messages are not duplicated.
 
     Returns:
         logging.Logger: A configured logger instance.
@@ -16,6 +28,9 @@ def create_console_logger():
     logger = logging.getLogger(__name__)
     # Set the level of the logger
     logger.setLevel(logging.DEBUG)
+    if any(isinstance(handler, logging.StreamHandler) and handler.stream is sys.stdout
+           for handler in logger.handlers):
+        return logger
     # Create custom handler. For example this handler is for logging to console
     console_handler = logging.StreamHandler(stream=sys.stdout)
     # Set the level of the handlers (can be different for each handler)
@@ -23,3 +38,158 @@ def create_console_logger():
     logger.addHandler(console_handler)
 
     return logger
+
+
+class BoundedQueueHandler(QueueHandler):
+    """A QueueHandler for a bounded queue that never stalls the logging thread
+    for long: when the queue is full, the record is dropped (overflow="drop") or
+    waited for up to block_timeout seconds before being dropped (overflow="block").
+    Dropped records are counted in the `dropped` attribute.
+    """
+    def __init__(self, log_queue, overflow="drop", block_timeout=0.1):
+        super().__init__(log_queue)
+        if overflow not in ("drop", "block"):
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def enqueue(self, record):
+        try:
+            if self.overflow == "block":
+                self.queue.put(record, timeout=self.block_timeout)
+            else:
+                self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+
+
+class _BatchFlushMixin:
+    """Write records without flushing; the listener flushes once per batch."""
+    def emit(self, record):
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+
+class _BatchStreamHandler(_BatchFlushMixin, logging.StreamHandler):
+    pass
+
+
+class _BatchFileHandler(_BatchFlushMixin, logging.FileHandler):
+    pass
+
+
+class _BatchQueueListener(QueueListener):
+    """A QueueListener that drains up to batch_size queued records at a time
+    and flushes its handlers once per batch instead of once per record."""
+    def __init__(self, log_queue, *handlers, batch_size=500):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.batch_size = batch_size
+
+    def enqueue_sentinel(self):
+        # The stop sentinel must get through even if the queue is full
+        self.queue.put(self._sentinel)
+
+    def _monitor(self):
+        log_queue = self.queue
+        has_task_done = hasattr(log_queue, 'task_done')
+        stop = False
+        while not stop:
+            batch = [log_queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(log_queue.get_nowait())
+                except queue.Empty:
+                    break
+            for record in batch:
+                if record is self._sentinel:
+                    stop = True
+                else:
+                    self.handle(record)
+                if has_task_done:
+                    log_queue.task_done()
+            for handler in self.handlers:
+                handler.flush()
+
+
+def create_async_logger(name=ASYNC_LOGGER_NAME, level=logging.DEBUG, log_file=None,
+                        max_queue_size=10000, overflow="drop", block_timeout=0.1, batch_size=500):
+    """
+    Creates a logger whose calls only put the record on a bounded queue; a
+    background listener thread writes the records to stdout (and optionally to
+    a file) in batches, so logging does not block the calling thread on I/O.
+
+    Setting up a logger with the same name again returns the existing logger.
+    The listener is stopped, and the remaining records flushed, at exit.
+
+    Args:
+        name (str): The logger name.
+        level (int): The level of the logger and its handlers.
+        log_file (str, optional): A file to write the records to in addition to stdout.
+        max_queue_size (int): The maximum number of records waiting to be written.
+        overflow (str): What to do when the queue is full: "drop" the record right
+            away, or "block" for up to block_timeout seconds before dropping it.
+        block_timeout (float): The maximum wait in seconds with overflow="block".
+        batch_size (int): The maximum number of records written per flush.
+
+    Returns:
+        logging.Logger: A configured logger instance.
+
+    Example:
+        logger = create_async_logger("service", log_file="service.log")
+        logger.info("started")
+        print(get_async_logger_stats("service"))  # {'queued': 1, 'dropped': 0}
+    """
+    with _async_loggers_lock:
+        if name in _async_loggers:
+            return _async_loggers[name][0]
+
+        formatter = logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s')
+        handlers = [_BatchStreamHandler(stream=sys.stdout)]
+        if log_file:
+            handlers.append(_BatchFileHandler(log_file, encoding='utf-8'))
+        for handler in handlers:
+            handler.setLevel(level)
+            handler.setFormatter(formatter)
+
+        log_queue = queue.Queue(maxsize=max_queue_size)
+        listener = _BatchQueueListener(log_queue, *handlers, batch_size=batch_size)
+        logger = logging.getLogger(name)
+        logger.setLevel(level)
+        logger.addHandler(BoundedQueueHandler(log_queue, overflow, block_timeout))
+        # Records are written by the listener's handlers only
+        logger.propagate = False
+        listener.start()
+        _async_loggers[name] = (logger, listener)
+        return logger
+
+
+def get_async_logger_stats(name=ASYNC_LOGGER_NAME) -> dict:
+    """Return the number of queued and dropped records of an async logger."""
+    logger, listener = _async_loggers[name]
+    dropped = sum(handler.dropped for handler in logger.handlers
+                  if isinstance(handler, BoundedQueueHandler))
+    return {"queued": listener.queue.qsize(), "dropped": dropped}
+
+
+def stop_async_logger(name=ASYNC_LOGGER_NAME):
+    """Stop the listener of an async logger after writing the queued records,
+    and detach its handlers."""
+    with _async_loggers_lock:
+        logger, listener = _async_loggers.pop(name)
+    listener.stop()
+    for handler in list(logger.handlers):
+        if isinstance(handler, BoundedQueueHandler):
+            logger.removeHandler(handler)
+    for handler in listener.handlers:
+        handler.close()
+
+
+@atexit.register
+def _stop_async_loggers():
+    for name in list(_async_loggers):
+        stop_async_logger(name)
@@ -1,19 +1,36 @@
+import os
 import re
 import datetime
+from collections import deque
+from functools import lru_cache
+from itertools import islice
 
 
+# Word boundaries inside camel/Pascal case: before an upper case letter that follows
+# a lower case letter or digit, and before the last capital of an acronym ("HTTPServer")
+_SNAKE_CASE_BOUNDARY = re.compile(r'(?<=[a-z0-9])(?=[A-Z])|(?<=[A-Z])(?=[A-Z][a-z])')
+
+
+@lru_cache(maxsize=65536)
 def to_snake_case(text: str) -> str:
     """Convert a string to snake_case.
 
+    Acronyms are kept together and digits stay attached to the preceding word.
+    Results are memoized in a bounded LRU cache, as keys tend to repeat.
+
     Example:
     print(to_snake_case("HelloWorld"))   # hello_world
+    print(to_snake_case("HTTPServer2"))  # http_server2
     """
-    return re.sub(r'(?<!^)(?=[A-Z])', '_', text).lower()
+    return _SNAKE_CASE_BOUNDARY.sub('_', text).lower()
 
 
+@lru_cache(maxsize=65536)
 def to_camel_case(text: str) -> str:
     """Convert a string to camelCase.
 
+    Results are memoized in a bounded LRU cache, as keys tend to repeat.
+
     Example:
     print(to_camel_case("hello_world"))  # helloWorld
     """
@@ -21,6 +38,75 @@ def to_camel_case(text: str) -> str:
     return parts[0] + ''.join(word.capitalize() for word in parts[1:])
 
 
+_CASE_CONVERTERS = {
+    "snake": to_snake_case,
+    "camel": to_camel_case,
+}
+
+
+def _convert_keys(obj, convert):
+    if isinstance(obj, dict):
+        changed = False
+        items = []
+        for key, value in obj.items():
+            new_key = convert(key) if isinstance(key, str) else key
+            new_value = _convert_keys(value, convert)
+            changed = changed or new_key != key or new_value is not value
+            items.append((new_key, new_value))
+        return dict(items) if changed else obj
+    if isinstance(obj, list):
+        new_items = [_convert_keys(item, convert) for item in obj]
+        if any(new_item is not item for new_item, item in zip(new_items, obj)):
+            return new_items
+        return obj
+    return obj
+
+
+def convert_keys(obj, style="snake"):
+    """Recursively convert the string keys of nested dicts (also inside lists) to
+    another case in one pass.
+
+    Subtrees whose keys do not change are returned as they are rather than copied,
+    so the input must not be mutated afterwards if the result is kept. If two keys
+    convert to the same key, the later one wins.
+
+    Args:
+        obj: A dict, list or any other value (returned unchanged).
+        style: "snake", "camel" or a function converting a single key.
+
+    Example:
+    print(convert_keys({"userId": 1, "items": [{"itemName": "a"}]}))
+    # {'user_id': 1, 'items': [{'item_name': 'a'}]}
+    """
+    if isinstance(style, str):
+        if style not in _CASE_CONVERTERS:
+            raise ValueError(f"Unknown case style: {style}")
+        style = _CASE_CONVERTERS[style]
+    return _convert_keys(obj, style)
+
+
+# Matches 3GPP-style file names, e.g. "A20230101.2300+0000-0000+0000_1.xml"
+FILENAME_DATETIME_PATTERN = re.compile(r'[A-Za-z]*(\d{8})\.(\d{4}[+-]\d{4})-(\d{4}[+-]\d{4}).*\.xml')
+
+
+@lru_cache(maxsize=None)
+def _utc_offset_timezone(offset: str) -> datetime.timezone:
+    """Return a (cached) timezone object for a UTC offset string in the form [+-]HHMM."""
+    if int(offset[3:5]) >= 60:
+        raise ValueError(f"Invalid UTC offset: {offset}")
+    delta = datetime.timedelta(hours=int(offset[1:3]), minutes=int(offset[3:5]))
+    if not delta:
+        return datetime.timezone.utc
+    return datetime.timezone(-delta if offset[0] == '-' else delta)
+
+
+def _build_datetime(date_str: str, time_str: str) -> datetime.datetime:
+    """Build a datetime from "YYYYMMDD" and "HHMM[+-]HHMM" strings by integer slicing."""
+    return datetime.datetime(int(date_str[:4]), int(date_str[4:6]), int(date_str[6:8]),
+                             int(time_str[:2]), int(time_str[2:4]),
+                             tzinfo=_utc_offset_timezone(time_str[4:]))
+
+
 def extract_datetime_from_filename(filename: str) -> tuple[datetime.datetime | None, datetime.datetime | None]:
     """Extracts start and end datetime from a filename with a specific pattern.
     Args:
@@ -29,28 +115,15 @@ def extract_datetime_from_filename(filename: str) -> tuple[datetime.datetime | N
     Returns:
         tuple: A tuple containing the start datetime object and the end datetime object.
     """
-    # Define the regex pattern to match the datetime format
-    pattern = r'[A-Za-z]*(\d{8})\.(\d{4}[+-]\d{4})-(\d{4}[+-]\d{4}).*\.xml'
-    # datetime formats
-    date_format = "%Y%m%d"
-    time_format = "%H%M%z"  # %z is UTC offset in the form [+-]HHMM
-    datetime_format = '.'.join([date_format, time_format])
     # init returned datetime objects
     start_datetime_obj, end_datetime_obj = None, None
     try:
-        # Use re.match to search for the pattern in the string
-        match = re.match(pattern, filename)
+        match = FILENAME_DATETIME_PATTERN.match(filename)
         if match:
             # Extract datetime components from the matched groups
-            start_date_str = match.group(1)
-            start_time_str = match.group(2)
-            end_time_str = match.group(3)
-            # parse start datetime
-            start_datetime_obj = datetime.datetime.strptime(
-                '.'.join([start_date_str, start_time_str]), datetime_format)
-            # parse end datetime
-            end_datetime_obj = datetime.datetime.strptime(
-                '.'.join([start_date_str, end_time_str]), datetime_format)
+            start_date_str, start_time_str, end_time_str = match.groups()
+            start_datetime_obj = _build_datetime(start_date_str, start_time_str)
+            end_datetime_obj = _build_datetime(start_date_str, end_time_str)
             # If the hour part of the end time is 0,
             # the end date is the next day of the start date
             if end_datetime_obj.hour == 0:
@@ -58,4 +131,70 @@ def extract_datetime_from_filename(filename: str) -> tuple[datetime.datetime | N
 
         return (start_datetime_obj, end_datetime_obj)
     except Exception:
-        raise ValueError("Error occurred in extracting start and end datetime from the filename: %s", filename)
+        raise ValueError(f"Error occurred in extracting start and end datetime from the filename: {filename}")
+
+
+def _extract_datetimes_from_filenames(filenames: list[str]) -> tuple[list[tuple], list[ValueError]]:
+    """Return (name, start, end) for each filename matching the datetime pattern,
+    and the errors of the matching names holding an invalid datetime."""
+    results, errors = [], []
+    for filename in filenames:
+        try:
+            start_datetime_obj, end_datetime_obj = extract_datetime_from_filename(filename)
+        except ValueError as error:
+            errors.append(error)
+            continue
+        if start_datetime_obj is not None:
+            results.append((filename, start_datetime_obj, end_datetime_obj))
+    return results, errors
+
+
+def _batched(iterable, size: int):
+    """Yield lists of up to size items from iterable."""
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def extract_datetimes_from_directory(path: str, workers: int | None = None, batch_size: int = 10000,
+                                     onerror=None):
+    """Lazily yield (name, start, end) for each file in a directory whose name
+    carries a start and end datetime (see extract_datetime_from_filename).
+
+    Args:
+        path (str): The directory to scan. Subdirectories are not visited.
+        workers (int, optional): If set, parse the names in a pool of this many
+            processes, which pays off for very large directories.
+        batch_size (int): The number of file names sent to a worker at once.
+        onerror (callable, optional): Called with the ValueError of each name that
+            matches the pattern but holds an invalid datetime; such names are skipped.
+
+    Example:
+        for name, start, end in extract_datetimes_from_directory("/data/pm", workers=4):
+            print(name, start, end)
+    """
+    def _results(batch_result):
+        results, errors = batch_result
+        if onerror:
+            for error in errors:
+                onerror(error)
+        return results
+
+    with os.scandir(path) as entries:
+        filenames = (entry.name for entry in entries if entry.is_file())
+        if not workers:
+            for batch in _batched(filenames, batch_size):
+                yield from _results(_extract_datetimes_from_filenames(batch))
+            return
+
+        # Only loaded when a process pool is actually requested
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # Keep a bounded number of batches in flight so the scan stays lazy
+            pending = deque()
+            for batch in _batched(filenames, batch_size):
+                pending.append(executor.submit(_extract_datetimes_from_filenames, batch))
+                if len(pending) >= workers * 2:
+                    yield from _results(pending.popleft().result())
+            while pending:
+                yield from _results(pending.popleft().result())
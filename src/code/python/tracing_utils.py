@@ -0,0 +1,142 @@
+import os
+import json
+import time
+import random
+import inspect
+import threading
+import contextvars
+from collections import deque, defaultdict
+from functools import wraps
+
+# The innermost open span of the current thread / asyncio task
+_current_span = contextvars.ContextVar("current_span", default=None)
+
+
+class _Span:
+    """A span context manager. `stack` is the tuple of span names from the root
+    to this span; `parent` is the enclosing span while the span is open."""
+    __slots__ = ("tracer", "name", "args", "stack", "parent", "sampled", "start_ns", "children_ns", "token")
+
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        parent = _current_span.get()
+        if parent is None:
+            tracer = self.tracer
+            self.sampled = tracer.enabled and (tracer.sample_rate >= 1 or random.random() < tracer.sample_rate)
+            self.stack = (self.name,)
+        else:
+            # Children of an unsampled span are not recorded either
+            self.sampled = parent.sampled
+            self.stack = parent.stack + (self.name,) if parent.sampled else parent.stack
+        self.parent = parent
+        self.children_ns = 0
+        self.token = _current_span.set(self)
+        self.start_ns = time.perf_counter_ns() if self.sampled else 0
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _current_span.reset(self.token)
+        if not self.sampled:
+            return
+        duration_ns = time.perf_counter_ns() - self.start_ns
+        if self.parent is not None:
+            self.parent.children_ns += duration_ns
+        # Concurrent children (e.g. gathered asyncio tasks) can overlap the whole span
+        self_ns = max(duration_ns - self.children_ns, 0)
+        self.tracer.spans.append((self.name, self.stack, self.start_ns, duration_ns,
+                                  self_ns, threading.get_ident(), self.args))
+        self.parent = None
+
+
+class Tracer:
+    """
+    A lightweight span tracer for timing nested hot paths.
+
+    Spans are timed with perf_counter_ns and nested through a context variable,
+    so parent/child relations are kept per thread and per asyncio task. To bound
+    the overhead, only a `sample_rate` fraction of the root spans is recorded;
+    the spans nested in a root span follow its sampling decision. Finished spans
+    are kept in a bounded buffer of `max_spans` entries.
+
+    Example:
+        tracer = Tracer(sample_rate=0.1)
+
+        @tracer.trace()
+        def handle(request):
+            with tracer.span("parse"):
+                ...
+            with tracer.span("render", template="index"):
+                ...
+
+        tracer.to_chrome_trace("trace.json")        # open in chrome://tracing or Perfetto
+        tracer.to_collapsed_stacks("stacks.txt")    # input for flamegraph.pl / speedscope
+    """
+    def __init__(self, sample_rate=1.0, max_spans=100000):
+        self.sample_rate = sample_rate
+        self.enabled = True
+        # Finished spans: (name, stack, start_ns, duration_ns, self_ns, thread_id, args)
+        self.spans = deque(maxlen=max_spans)
+        self._origin_ns = time.perf_counter_ns()
+
+    def span(self, name, **args):
+        """Return a context manager timing the enclosed block as a span named `name`;
+        keyword arguments are attached to the span in the Chrome trace export."""
+        return _Span(self, name, args)
+
+    def trace(self, name=None):
+        """A decorator recording each call of a function (or coroutine function) as a span."""
+        def decorator(func):
+            span_name = name or func.__qualname__
+            if inspect.iscoroutinefunction(func):
+                @wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    with self.span(span_name):
+                        return await func(*args, **kwargs)
+                return async_wrapper
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(span_name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def clear(self):
+        self.spans.clear()
+
+    def to_chrome_trace(self, file_path=None):
+        """Return the spans in Chrome trace-event format (complete "X" events with
+        microsecond timestamps), optionally writing it to a JSON file."""
+        pid = os.getpid()
+        events = [{"name": name, "ph": "X", "pid": pid, "tid": thread_id,
+                   "ts": (start_ns - self._origin_ns) / 1000, "dur": duration_ns / 1000,
+                   "args": {key: str(value) for key, value in args.items()}}
+                  for name, _, start_ns, duration_ns, _, thread_id, args in list(self.spans)]
+        chrome_trace = {"traceEvents": events, "displayTimeUnit": "ms"}
+        if file_path:
+            with open(file_path, 'w', encoding='utf-8') as file:
+                json.dump(chrome_trace, file)
+        return chrome_trace
+
+    def to_collapsed_stacks(self, file_path=None):
+        """Return the spans in the collapsed-stack format used by flame graph tools:
+        one "root;child;grandchild <self time in us>" line per distinct stack,
+        optionally writing it to a file."""
+        self_us = defaultdict(int)
+        for _, stack, _, _, self_ns, _, _ in list(self.spans):
+            self_us[';'.join(stack)] += self_ns // 1000
+        content = ''.join(f"{stack} {value}\n" for stack, value in sorted(self_us.items()))
+        if file_path:
+            with open(file_path, 'w', encoding='utf-8') as file:
+                file.write(content)
+        return content
+
+
+# A process-wide default tracer and shortcuts to it
+tracer = Tracer()
+span = tracer.span
+trace = tracer.trace
@@ -1,6 +1,22 @@
 import os
-import psutil
+import time
+import threading
 import tracemalloc
+from array import array
+from contextlib import contextmanager
+from datetime import datetime
+
+_process = None
+
+
+def _get_process():
+    """Return a psutil.Process handle for the current process, created once per pid."""
+    global _process
+    if _process is None or _process.pid != os.getpid():
+        # psutil is imported on first use to keep module import cheap
+        import psutil
+        _process = psutil.Process(os.getpid())
+    return _process
 
 
 def get_process_memory(convert_to_mb=False):
@@ -11,7 +27,7 @@ def get_process_memory(convert_to_mb=False):
     current process, which represents the portion of memory occupied by the
     process that is held in RAM.
     """
-    process = psutil.Process(os.getpid())
+    process = _get_process()
     mem_usage = process.memory_info().rss  # in bytes
     if convert_to_mb:
         mem_usage = mem_usage / (1024 * 1024)
@@ -45,12 +61,17 @@ def analyze_memory_usage(func, *args, **kwargs):
         /path/to/file.py:line_number: memory usage details
         ...
     """
-    tracemalloc.start()
-
-    # Execute the passed function
-    result = func(*args, **kwargs)
-
-    snapshot = tracemalloc.take_snapshot()
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        # Execute the passed function
+        result = func(*args, **kwargs)
+        snapshot = tracemalloc.take_snapshot()
+    finally:
+        # Only stop tracing if it was started here, so its overhead does not persist
+        if not was_tracing:
+            tracemalloc.stop()
     top_stats = snapshot.statistics('lineno')
 
     print("[ Top 10 ]")
@@ -58,3 +79,140 @@ def analyze_memory_usage(func, *args, **kwargs):
         print(stat)
 
     return result
+
+
+@contextmanager
+def memory_snapshot_diff(key_type='lineno', limit=10):
+    """
+    A context manager that compares tracemalloc snapshots taken on entry and exit
+    of the block. Tracing is started for the block only (unless it was already on),
+    so there is no lasting overhead.
+
+    Yields a list that is filled on exit with the `limit` largest
+    tracemalloc.StatisticDiff entries, grouped by key_type ('lineno', 'filename'
+    or 'traceback').
+
+    Example:
+        >>> with memory_snapshot_diff() as top_diffs:
+        ...     data = [str(i) for i in range(100000)]
+        >>> for stat in top_diffs:
+        ...     print(stat)
+        /path/to/file.py:2: size=5.8 MiB (+5.8 MiB), count=100001 (+100001), average=61 B
+    """
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    exclude_tracemalloc = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    top_diffs = []
+    before = tracemalloc.take_snapshot().filter_traces(exclude_tracemalloc)
+    try:
+        yield top_diffs
+    finally:
+        after = tracemalloc.take_snapshot().filter_traces(exclude_tracemalloc)
+        if not was_tracing:
+            tracemalloc.stop()
+        top_diffs.extend(after.compare_to(before, key_type)[:limit])
+
+
+class MemorySampler:
+    """
+    Samples the memory usage (RSS, and optionally USS) of the current process in a
+    background thread at a fixed interval.
+
+    Samples are stored in a fixed-size ring buffer backed by typed arrays, so the
+    memory used by the sampler itself is constant: once `capacity` samples have
+    been taken, the oldest ones are overwritten.
+
+    Example:
+        >>> with MemorySampler(interval=0.05) as sampler:
+        ...     run_workload()
+        >>> drawer = PltGraphDrawer(title="Memory")
+        >>> sampler.add_to_drawer(drawer)
+        >>> drawer.draw_graph()
+        >>> drawer.save_figure("memory")
+    """
+    def __init__(self, interval=0.1, capacity=10000, include_uss=False):
+        self.interval = interval
+        self.capacity = capacity
+        # USS needs memory_full_info(), which is considerably slower than memory_info()
+        self.include_uss = include_uss
+        self._times = array('d', bytes(8 * capacity))
+        self._rss = array('q', bytes(8 * capacity))
+        self._uss = array('q', bytes(8 * capacity)) if include_uss else None
+        self._count = 0
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        process = _get_process()
+        if self.include_uss:
+            info = process.memory_full_info()
+        else:
+            info = process.memory_info()
+        with self._lock:
+            index = self._count % self.capacity
+            self._times[index] = time.time()
+            self._rss[index] = info.rss
+            if self.include_uss:
+                self._uss[index] = info.uss
+            self._count += 1
+
+    def _run(self):
+        self._sample()
+        while not self._stop_event.wait(self.interval):
+            self._sample()
+
+    def start(self):
+        if self._thread is not None:
+            return self
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="memory-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+        # Take a final sample so the series covers the whole sampled period
+        self._sample()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def _ordered(self, values):
+        """Return the ring buffer contents in chronological order."""
+        if self._count <= self.capacity:
+            return values[:self._count]
+        start = self._count % self.capacity
+        return values[start:] + values[:start]
+
+    def series(self):
+        """Return the samples in chronological order as a dict of typed arrays:
+        "time" (seconds since the epoch), "rss" and, if sampled, "uss" (bytes)."""
+        with self._lock:
+            result = {"time": self._ordered(self._times), "rss": self._ordered(self._rss)}
+            if self.include_uss:
+                result["uss"] = self._ordered(self._uss)
+        return result
+
+    def to_plot_data(self, convert_to_mb=True, title="Memory usage"):
+        """Return the series as subplot data for graph_drawer's add_subplot_data()."""
+        series = self.series()
+        divisor = 1024 * 1024 if convert_to_mb else 1
+        x_data = [datetime.fromtimestamp(timestamp) for timestamp in series["time"]]
+        lines = [{"x": x_data, "y": [value / divisor for value in series["rss"]], "label": "RSS"}]
+        if "uss" in series:
+            lines.append({"x": x_data, "y": [value / divisor for value in series["uss"]], "label": "USS"})
+        return {"title": title, "y_label": "MB" if convert_to_mb else "bytes", "data": lines}
+
+    def add_to_drawer(self, drawer, convert_to_mb=True, title="Memory usage"):
+        """Add the series as a new subplot of a PlotlyGraphDrawer or PltGraphDrawer."""
+        drawer.add_subplot_data(self.to_plot_data(convert_to_mb, title))
+        return drawer